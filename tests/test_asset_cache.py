@@ -0,0 +1,100 @@
+"""Tests for asset_cache (fake client, no CDF required)."""
+from types import SimpleNamespace
+
+import pytest
+
+from asset_cache import AssetHierarchyCache, get_asset_cache
+
+
+def _asset(id, name, parent_id=None, updated=None, external_id=None):
+    updated = id if updated is None else updated
+    return SimpleNamespace(id=id, name=name, parent_id=parent_id, last_updated_time=updated, external_id=external_id)
+
+
+class _FakeAssets:
+    def __init__(self, assets):
+        self.assets = assets
+        self.calls = []
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        lut = kwargs.get("last_updated_time")
+        if lut is None:
+            return list(self.assets)
+        return [a for a in self.assets if a.last_updated_time >= lut["min"]]
+
+
+def _client(assets):
+    return SimpleNamespace(config=SimpleNamespace(project="proj"), assets=_FakeAssets(assets))
+
+
+def _world():
+    return [
+        _asset(1, "World", external_id="world"),
+        _asset(2, "Europe", 1),
+        _asset(3, "Asia", 1),
+        _asset(4, "Northern Europe", 2),
+        _asset(5, "Finland", 4, external_id="FIN"),
+        _asset(6, "Norway", 4),
+    ]
+
+
+def test_indexes_and_subtree():
+    """Name, external id and parent lookups work from memory after one refresh."""
+    cache = AssetHierarchyCache(_client(_world()))
+    assert cache.refresh() == 6
+    assert cache.id_for_name("Finland") == 5
+    assert cache.get_by_external_id("FIN").name == "Finland"
+    assert [a.id for a in cache.children(1)] == [2, 3]
+    assert [a.id for a in cache.roots()] == [1]
+    assert [a.id for a in cache.subtree(2)] == [2, 4, 5, 6]
+    assert [a.id for a in cache.subtree(1, include_root=False, max_depth=1)] == [2, 3]
+    assert [a.id for a in cache.ancestors(5)] == [4, 2, 1]
+    assert cache.name_to_id()["Asia"] == 3
+
+
+def test_incremental_refresh_uses_last_updated_time_and_moves_assets():
+    """Second refresh filters on lastUpdatedTime and re-indexes a renamed/moved asset."""
+    assets = _world()
+    client = _client(assets)
+    cache = AssetHierarchyCache(client, data_set_ids=[7])
+    cache.refresh()
+    assets[5] = _asset(6, "Kingdom of Norway", 2, updated=10)
+    assert cache.refresh() == 1
+    assert client.assets.calls[-1]["last_updated_time"] == {"min": 6}
+    assert client.assets.calls[-1]["data_set_ids"] == [7]
+    assert cache.ids_for_name("Norway") == []
+    assert cache.id_for_name("Kingdom of Norway") == 6
+    assert [a.id for a in cache.children(4)] == [5]
+    assert 6 in [a.id for a in cache.children(2)]
+    assert cache.last_updated_time == 10
+
+
+def test_full_refresh_drops_deleted_assets():
+    assets = _world()
+    cache = AssetHierarchyCache(_client(assets))
+    cache.refresh()
+    del assets[-1]
+    cache.refresh(full=True)
+    assert 6 not in cache
+    assert len(cache) == 5
+
+
+def test_id_for_name_errors():
+    """Missing names raise KeyError, duplicates raise ValueError."""
+    cache = AssetHierarchyCache(_client(_world() + [_asset(7, "Finland", 3)]))
+    cache.refresh()
+    with pytest.raises(KeyError):
+        cache.id_for_name("Atlantis")
+    with pytest.raises(ValueError):
+        cache.id_for_name("Finland")
+    assert "Finland" not in cache.name_to_id()
+
+
+def test_get_asset_cache_is_shared_per_project_and_data_set():
+    client = _client(_world())
+    first = get_asset_cache(client, data_set_ids=[99])
+    second = get_asset_cache(client, data_set_ids=[99])
+    assert first is second
+    assert client.assets.calls[-1]["last_updated_time"] == {"min": 6}
+    assert get_asset_cache(client, data_set_ids=[98]) is not first
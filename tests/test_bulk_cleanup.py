@@ -0,0 +1,112 @@
+"""Tests for bulk_cleanup (fake client, no CDF required)."""
+from types import SimpleNamespace
+
+import pytest
+
+from bulk_cleanup import DELETE_ORDER, asset_delete_levels, cleanup, collect_cleanup_targets
+
+
+def _res(id, external_id, parent_id=None):
+    return SimpleNamespace(id=id, external_id=external_id, parent_id=parent_id)
+
+
+def _rel(external_id, source, target):
+    return SimpleNamespace(external_id=external_id, source_external_id=source, target_external_id=target)
+
+
+class _FakeApi:
+    def __init__(self, name, items, log):
+        self.name = name
+        self.items = items
+        self.log = log
+        self.list_calls = []
+
+    def list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        prefix = kwargs.get("external_id_prefix")
+        items = self.items
+        if prefix:
+            items = [i for i in items if i.external_id.startswith(prefix)]
+        for side in ("source_external_ids", "target_external_ids"):
+            if side in kwargs:
+                attr = side.replace("_ids", "_id")
+                items = [i for i in items if getattr(i, attr) in kwargs[side]]
+        return items
+
+    def delete(self, **kwargs):
+        self.log.append((self.name, kwargs))
+
+
+def _client(**items):
+    log = []
+    apis = {name: _FakeApi(name, items.get(name, []), log) for name in DELETE_ORDER}
+    return SimpleNamespace(config=SimpleNamespace(project="proj"), log=log, **apis)
+
+
+def _training_client():
+    return _client(
+        assets=[_res(1, "me_root"), _res(2, "me_child", 1), _res(3, "me_leaf", 2), _res(4, "me_other_root")],
+        time_series=[_res(10, "me_ts")],
+        events=[_res(20, "me_event")],
+        relationships=[_rel("rel_a", "me_root", "me_ts"), _rel("rel_b", "x", "y"), _rel("me_rel", "x", "y")],
+    )
+
+
+def test_collect_requires_a_filter():
+    with pytest.raises(ValueError):
+        collect_cleanup_targets(_client())
+
+
+def test_collect_by_prefix_includes_attached_relationships():
+    client = _training_client()
+    targets = collect_cleanup_targets(client, external_id_prefix="me_")
+    assert list(targets) == list(DELETE_ORDER)
+    assert len(targets["assets"]) == 4
+    assert sorted(r.external_id for r in targets["relationships"]) == ["rel_a"]
+    assert client.assets.list_calls[0]["external_id_prefix"] == "me_"
+
+
+def test_collect_by_data_set_lists_relationships_by_data_set():
+    client = _training_client()
+    targets = collect_cleanup_targets(client, data_set_external_ids=["me"])
+    assert len(targets["relationships"]) == 3
+    assert client.relationships.list_calls == [{"data_set_ids": None, "data_set_external_ids": ["me"], "limit": -1}]
+
+
+def test_asset_delete_levels_leaves_first():
+    assets = [_res(1, "r"), _res(2, "c", 1), _res(3, "l", 2), _res(4, "r2"), _res(5, "orphan", 99)]
+    assert asset_delete_levels(assets) == [[3], [2], [1, 4, 5]]
+
+
+def test_cleanup_dry_run_deletes_nothing():
+    client = _training_client()
+    summary = cleanup(client, external_id_prefix="me_")
+    assert client.log == []
+    assert dict(zip(summary["resource"], summary["count"]))["assets"] == 4
+    assert not summary["deleted"].any()
+
+
+def test_cleanup_deletes_in_dependency_order():
+    client = _training_client()
+    summary = cleanup(client, external_id_prefix="me_", dry_run=False, batch_size=1)
+    order = [name for name, _ in client.log]
+    assert order.index("relationships") < order.index("time_series") < order.index("assets")
+    asset_deletes = [kw["id"] for name, kw in client.log if name == "assets"]
+    assert asset_deletes[0] == [3] and asset_deletes[1] == [2]
+    assert sorted(i for ids in asset_deletes[2:] for i in ids) == [1, 4]
+    assert client.log[0] == ("relationships", {"external_id": ["rel_a"], "ignore_unknown_ids": True})
+    assert summary["deleted"].all()
+
+
+def test_cleanup_recursive_assets_deletes_only_roots():
+    client = _training_client()
+    cleanup(client, external_id_prefix="me_", dry_run=False, recursive_assets=True)
+    asset_calls = [kw for name, kw in client.log if name == "assets"]
+    assert asset_calls == [{"id": [1, 4], "ignore_unknown_ids": True, "recursive": True}]
+
+
+def test_cleanup_passes_partitions_and_respects_verbose(capsys):
+    client = _training_client()
+    cleanup(client, external_id_prefix="me_", partitions=4, verbose=False)
+    assert client.assets.list_calls[0]["partitions"] == 4
+    assert capsys.readouterr().out == ""
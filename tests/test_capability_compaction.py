@@ -0,0 +1,73 @@
+"""Tests for capability_compaction (no CDF client required)."""
+from types import SimpleNamespace
+
+from cognite.client.data_classes.capabilities import Capability
+
+from capability_compaction import compact_capabilities, compact_capability_dicts
+from group_backup_restore import group_backup_records
+
+
+def _cap(acl, actions, scope):
+    return {acl: {"actions": actions, "scope": scope}}
+
+
+def _ds(*ids):
+    return {"datasetScope": {"ids": list(ids)}}
+
+
+def test_merges_dataset_ids_for_same_actions():
+    caps = [_cap("assetsAcl", ["READ"], _ds(2)), _cap("assetsAcl", ["READ"], _ds(1, 2))]
+    assert compact_capability_dicts(caps) == [_cap("assetsAcl", ["READ"], _ds(1, 2))]
+
+
+def test_does_not_widen_actions_across_different_scopes():
+    """READ on ds 1 and WRITE on ds 2 must not become READ+WRITE on both."""
+    caps = [_cap("assetsAcl", ["READ"], _ds(1)), _cap("assetsAcl", ["WRITE"], _ds(2))]
+    assert sorted(map(str, compact_capability_dicts(caps))) == sorted(map(str, caps))
+
+
+def test_merges_actions_for_identical_scope_then_ids():
+    caps = [
+        _cap("assetsAcl", ["READ"], _ds(1)),
+        _cap("assetsAcl", ["WRITE"], _ds(1)),
+        _cap("assetsAcl", ["READ", "WRITE"], _ds(2)),
+    ]
+    assert compact_capability_dicts(caps) == [_cap("assetsAcl", ["READ", "WRITE"], _ds(1, 2))]
+
+
+def test_all_scope_covers_scoped_actions():
+    caps = [
+        _cap("timeSeriesAcl", ["READ", "WRITE"], _ds(1)),
+        _cap("timeSeriesAcl", ["READ"], {"all": {}}),
+        _cap("timeSeriesAcl", ["READ"], {"idScope": {"ids": [5]}}),
+    ]
+    assert compact_capability_dicts(caps) == [
+        _cap("timeSeriesAcl", ["READ"], {"all": {}}),
+        _cap("timeSeriesAcl", ["WRITE"], _ds(1)),
+    ]
+
+
+def test_other_acls_and_complex_scopes_are_kept():
+    table = {"tableScope": {"dbsToTables": {"db": {"tables": ["t"]}}}}
+    caps = [_cap("rawAcl", ["READ"], table), _cap("rawAcl", ["LIST"], table), _cap("eventsAcl", ["READ"], {"all": {}})]
+    assert compact_capability_dicts(caps) == [
+        _cap("eventsAcl", ["READ"], {"all": {}}),
+        _cap("rawAcl", ["LIST", "READ"], table),
+    ]
+
+
+def test_compact_capabilities_round_trips_objects():
+    caps = [Capability.load(_cap("assetsAcl", ["READ"], _ds(1))), Capability.load(_cap("assetsAcl", ["READ"], _ds(3)))]
+    compacted = compact_capabilities(caps)
+    assert len(compacted) == 1
+    assert compacted[0].dump(camel_case=True) == _cap("assetsAcl", ["READ"], _ds(1, 3))
+
+
+def test_group_backup_records_compact():
+    group = SimpleNamespace(
+        id=1,
+        name="g",
+        capabilities=[Capability.load(_cap("assetsAcl", ["READ"], _ds(1))), Capability.load(_cap("assetsAcl", ["READ"], _ds(2)))],
+    )
+    assert len(group_backup_records([group])[0]["capabilities"]) == 2
+    assert group_backup_records([group], compact=True)[0]["capabilities"] == [_cap("assetsAcl", ["READ"], _ds(1, 2))]
@@ -63,3 +63,151 @@ def test_client_with_fallback_never_raises_none():
                 client_with_fallback(customer, token_cache_path=None)
     assert exc_info.value is not None
     assert isinstance(exc_info.value, BaseException)
+
+
+class _FakeCredentials:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def authorization_header(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("refresh token expired")
+        return "Authorization", "Bearer t"
+
+
+def _fake_client(credentials):
+    from types import SimpleNamespace
+
+    return SimpleNamespace(config=SimpleNamespace(credentials=credentials))
+
+
+def test_token_refresher_refresh_now_collects_errors():
+    """refresh_now touches every client's credentials and records failures per name."""
+    from cognite_auth import TokenRefresher
+
+    ok, bad = _FakeCredentials(), _FakeCredentials(fail=True)
+    refresher = TokenRefresher()
+    refresher.register("a", _fake_client(ok), start=False)
+    refresher.register("b", _fake_client(bad), start=False)
+    results = refresher.refresh_now()
+    assert results["a"] is None
+    assert isinstance(results["b"], RuntimeError)
+    assert ok.calls == 1 and bad.calls == 1
+    assert list(refresher.last_errors) == ["b"]
+    refresher.unregister("b")
+    refresher.refresh_now()
+    assert bad.calls == 1 and refresher.last_errors == {}
+
+
+def test_token_refresher_background_thread_polls():
+    """With a short interval the daemon thread refreshes without any caller involvement."""
+    import time
+
+    from cognite_auth import TokenRefresher
+
+    creds = _FakeCredentials()
+    refresher = TokenRefresher(interval=0.01)
+    refresher.register("a", _fake_client(creds))
+    try:
+        deadline = time.time() + 2
+        while creds.calls < 2 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop(timeout=1)
+    assert creds.calls >= 2
+    assert not refresher.running
+
+
+def test_device_code_client_background_refresh_registers_and_widens_leeway():
+    """background_refresh=True builds credentials with the refresh margin and registers the client."""
+    from cognite_auth import DEFAULT_REFRESH_MARGIN_SECONDS, default_token_refresher, device_code_client
+
+    customer = next(iter(CUSTOMER_CONFIGS))
+    refresher = default_token_refresher()
+    with patch("cognite_auth.OAuthDeviceCode.default_for_azure_ad") as factory, patch(
+        "cognite_auth._create_client", return_value=_fake_client(_FakeCredentials())
+    ), patch.object(refresher, "start"):
+        client = device_code_client(customer, background_refresh=True)
+    assert factory.call_args.kwargs["token_expiry_leeway_seconds"] == DEFAULT_REFRESH_MARGIN_SECONDS
+    assert refresher._clients[customer] is client
+    refresher.unregister(customer)
+
+
+def test_token_refresher_skips_device_code_client_without_refresh_token():
+    """No cached refresh token: the client is skipped (no device-code prompt) and the skip is recorded."""
+    import msal
+    from types import SimpleNamespace
+
+    from cognite.client.credentials import OAuthDeviceCode
+
+    from cognite_auth import TokenRefresher
+
+    credentials = OAuthDeviceCode.__new__(OAuthDeviceCode)
+    credentials._OAuthDeviceCode__client_id = "client"
+    credentials._OAuthDeviceCode__scopes = ["https://x.cognitedata.com/user_impersonation", "openid"]
+    credentials._OAuthDeviceCode__app = SimpleNamespace(token_cache=msal.TokenCache())
+    credentials.token_expiry_leeway_seconds = 300
+    prompts = []
+    credentials.authorization_header = lambda: prompts.append(1)
+
+    refresher = TokenRefresher()
+    refresher.register("a", _fake_client(credentials), start=False)
+    results = refresher.refresh_now()
+    assert prompts == []
+    assert isinstance(results["a"], RuntimeError)
+    assert "refresh token" in str(refresher.last_errors["a"])
+
+
+def test_token_refresher_stops_when_last_client_unregistered():
+    """The daemon thread ends once nothing is registered, and restarts on the next register."""
+    from cognite_auth import TokenRefresher
+
+    refresher = TokenRefresher(interval=0.01)
+    refresher.register("a", _fake_client(_FakeCredentials()))
+    refresher.register("b", _fake_client(_FakeCredentials()))
+    refresher.unregister("a")
+    assert refresher.running
+    thread = refresher._thread
+    refresher.unregister("b")
+    assert not refresher.running
+    thread.join(1)
+    assert not thread.is_alive()
+    refresher.register("c", _fake_client(_FakeCredentials()))
+    try:
+        assert refresher.running and refresher._thread is not thread
+    finally:
+        refresher.stop(timeout=1)
+
+
+def test_export_groups_unregisters_background_refresh_clients(tmp_path):
+    """export_groups(background_refresh=True) does not leave clients in the shared refresher."""
+    from types import SimpleNamespace
+
+    import cognite_groups_export
+    from cognite_auth import default_token_refresher
+
+    from cognite.client.data_classes.capabilities import Capability
+
+    customer = next(iter(CUSTOMER_CONFIGS))
+    refresher = default_token_refresher()
+    group = SimpleNamespace(
+        id=1, name="g", source_id="", capabilities=[Capability.load({"assetsAcl": {"actions": ["READ"], "scope": {"all": {}}}})]
+    )
+
+    def fake_client_with_fallback(name, cache_path, verbose=False, background_refresh=False):
+        client = SimpleNamespace(
+            config=SimpleNamespace(project="proj", credentials=_FakeCredentials()),
+            iam=SimpleNamespace(groups=SimpleNamespace(list=lambda all: [group])),
+        )
+        refresher.register(name, client, start=False)
+        return client
+
+    with patch.object(cognite_groups_export, "client_with_fallback", fake_client_with_fallback), patch.object(
+        cognite_groups_export, "write_groups_to_excel"
+    ):
+        cognite_groups_export.export_groups(
+            customer, tmp_path / "out.xlsx", show_profile=False, verbose=False, background_refresh=True
+        )
+    assert customer not in refresher._clients
@@ -0,0 +1,90 @@
+"""Tests for federated_query (fake clients, no CDF required)."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import rate_limiter
+from cognite_auth import CUSTOMER_CONFIGS, resolve_customers
+from federated_query import federated_list, federated_query
+from rate_limiter import get_limiter, limited_call
+
+
+class _FakeList(list):
+    def to_pandas(self):
+        return pd.DataFrame(list(self))
+
+
+def _factory(data, fail_auth=()):
+    def make(customer):
+        if customer in fail_auth:
+            raise RuntimeError("auth failed")
+        rows = data[customer]
+
+        def list_assets(**kwargs):
+            if isinstance(rows, Exception):
+                raise rows
+            return _FakeList(rows)
+
+        return SimpleNamespace(config=SimpleNamespace(project=f"proj-{customer}"), assets=SimpleNamespace(list=list_assets))
+
+    return make
+
+
+def test_resolve_customers():
+    assert resolve_customers() == list(CUSTOMER_CONFIGS)
+    assert resolve_customers("a") == ["a"]
+    with pytest.raises(ValueError):
+        resolve_customers([])
+
+
+def test_federated_list_merges_with_customer_column():
+    data = {"a": [{"id": 1, "name": "x"}], "b": [{"id": 2, "name": "y"}, {"id": 3, "name": "z"}]}
+    df = federated_list("assets", ["a", "b"], client_factory=_factory(data), limit=-1)
+    assert list(df.columns) == ["customer", "id", "name"]
+    assert df.groupby("customer").size().to_dict() == {"a": 1, "b": 2}
+    assert df.attrs["errors"] == {}
+
+
+def test_federated_query_collects_errors():
+    data = {"a": [{"id": 1}], "b": RuntimeError("403"), "c": []}
+    df = federated_query(lambda c: c.assets.list(), ["a", "b", "c", "d"], client_factory=_factory(data, fail_auth={"d"}))
+    assert df["customer"].tolist() == ["a"]
+    assert set(df.attrs["errors"]) == {"b", "d"}
+    with pytest.raises(RuntimeError):
+        federated_query(lambda c: c.assets.list(), ["a", "b"], client_factory=_factory(data), raise_on_error=True)
+
+
+def test_federated_query_allows_limited_calls_inside_query():
+    """The query is not run inside a limiter slot, so nested limited calls cannot deadlock at limit 1."""
+    rate_limiter.reset_limiters()
+    try:
+        get_limiter("proj-a", initial_limit=1)
+        data = {"a": [{"id": 1}, {"id": 2}]}
+        df = federated_query(lambda c: limited_call(c, c.assets.list), ["a"], client_factory=_factory(data))
+        assert df["id"].tolist() == [1, 2]
+    finally:
+        rate_limiter.reset_limiters()
+
+
+def test_federated_query_runs_one_query_per_project():
+    """Customers on the same project take turns; the query is never run concurrently for one project."""
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def query(client):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return [{"id": 1}]
+
+    def factory(customer):
+        return SimpleNamespace(config=SimpleNamespace(project="shared"))
+
+    df = federated_query(query, ["a", "b", "c"], client_factory=factory)
+    assert len(df) == 3
+    assert peak[0] == 1
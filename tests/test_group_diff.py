@@ -0,0 +1,88 @@
+"""Tests for group_diff (no CDF client required)."""
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+
+from group_diff import (
+    capability_set_hash,
+    diff_backup_against_live,
+    diff_backup_files,
+    diff_backups,
+    write_diff_report,
+)
+
+ASSETS_READ = {"assetsAcl": {"actions": ["READ"], "scope": {"all": {}}}}
+TS_RW_DS = {"timeSeriesAcl": {"actions": ["READ", "WRITE"], "scope": {"datasetScope": {"ids": [3, 1]}}}}
+TS_WR_DS_REORDERED = {"timeSeriesAcl": {"scope": {"datasetScope": {"ids": [1, 3]}}, "actions": ["WRITE", "READ"]}}
+
+
+def _backup(*groups):
+    return {"cust": [{"id": gid, "name": name, "capabilities": caps} for gid, name, caps in groups]}
+
+
+def test_hash_ignores_order_and_duplicates():
+    assert capability_set_hash([ASSETS_READ, TS_RW_DS]) == capability_set_hash([TS_WR_DS_REORDERED, ASSETS_READ, ASSETS_READ])
+    assert capability_set_hash([ASSETS_READ]) != capability_set_hash([TS_RW_DS])
+
+
+def test_diff_backups_reports_added_removed_changed():
+    old = _backup((1, "same", [ASSETS_READ]), (2, "gone", [ASSETS_READ]), (3, "edit", [ASSETS_READ, TS_RW_DS]))
+    new = _backup((1, "same", [ASSETS_READ]), (3, "edit", [TS_WR_DS_REORDERED]), (4, "new", [ASSETS_READ]))
+    report = diff_backups(old, new).set_index("group_id")
+    assert list(report.index) == [2, 3, 4]
+    assert report.loc[2, "change"] == "removed" and report.loc[2, "removed_keys"] == ["assets:read"]
+    assert report.loc[3, "change"] == "changed"
+    assert report.loc[3, "removed_keys"] == ["assets:read"] and report.loc[3, "added_keys"] == []
+    assert report.loc[4, "change"] == "added" and report.loc[4, "added_keys"] == ["assets:read"]
+
+
+def test_diff_backups_renamed_group():
+    report = diff_backups(_backup((1, "a", [ASSETS_READ])), _backup((1, "b", [ASSETS_READ])))
+    assert report["change"].tolist() == ["renamed"]
+    assert report["group_name"].tolist() == ["b"]
+
+
+def test_diff_backup_files_and_report_formats(tmp_path):
+    old_path, new_path = tmp_path / "old.json", tmp_path / "new.json"
+    old_path.write_text(json.dumps(_backup((1, "g", [ASSETS_READ]))), encoding="utf-8")
+    new_path.write_text(json.dumps(_backup((1, "g", [ASSETS_READ, TS_RW_DS]))), encoding="utf-8")
+    report = diff_backup_files(old_path, new_path)
+    assert len(report["added_keys"][0]) == 2
+    write_diff_report(report, tmp_path / "r.json")
+    assert json.loads((tmp_path / "r.json").read_text())[0]["change"] == "changed"
+    write_diff_report(report, tmp_path / "r.xlsx")
+    assert pd.read_excel(tmp_path / "r.xlsx")["added_keys"][0].count("\n") == 1
+
+
+def test_diff_backup_against_live_skips_failed_customers():
+    from cognite.client.data_classes.capabilities import Capability
+
+    live_group = SimpleNamespace(id=1, name="g", capabilities=[Capability.load(TS_RW_DS)])
+    backup = {"cust": [{"id": 1, "name": "g", "capabilities": [TS_WR_DS_REORDERED]}], "down": []}
+    report = diff_backup_against_live(backup, {"cust": [live_group], "down": None})
+    assert report.empty
+
+
+def test_compacted_backup_against_identical_live_group_is_empty():
+    """A backup written with compact=True matches the uncompacted live group it was taken from."""
+    from cognite.client.data_classes.capabilities import Capability
+
+    from group_backup_restore import group_backup_records
+
+    ds1 = {"timeSeriesAcl": {"actions": ["READ"], "scope": {"datasetScope": {"ids": [1]}}}}
+    ds2 = {"timeSeriesAcl": {"actions": ["READ"], "scope": {"datasetScope": {"ids": [2]}}}}
+    live_group = SimpleNamespace(id=1, name="g", capabilities=[Capability.load(ds1), Capability.load(ds2)])
+    backup = {"cust": group_backup_records([live_group], compact=True)}
+    assert len(backup["cust"][0]["capabilities"]) == 1
+    assert diff_backup_against_live(backup, {"cust": [live_group]}).empty
+
+
+def test_split_grant_reports_only_the_new_key():
+    """Adding a separate data set entry reports just that key, not a merged scope."""
+    ds1 = {"timeSeriesAcl": {"actions": ["READ"], "scope": {"datasetScope": {"ids": [1]}}}}
+    ds2 = {"timeSeriesAcl": {"actions": ["READ"], "scope": {"datasetScope": {"ids": [2]}}}}
+    report = diff_backups(_backup((1, "g", [ds1])), _backup((1, "g", [ds1, ds2])))
+    assert report["change"].tolist() == ["changed"]
+    assert report.loc[0, "removed_keys"] == []
+    assert len(report.loc[0, "added_keys"]) == 1 and "ids=[2]" in report.loc[0, "added_keys"][0]
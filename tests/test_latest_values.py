@@ -0,0 +1,94 @@
+"""Tests for latest_values (fake client, no CDF required)."""
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from latest_values import LatestValueCache
+
+SERIES = {
+    1: ("fin_pop", 1609459200000, 5_530_000.0),
+    2: ("nor_pop", 1609459200000, 5_400_000.0),
+    3: ("empty", None, None),
+}
+
+
+class _FakeData:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def retrieve_latest(self, ignore_unknown_ids, id=None, external_id=None):
+        assert ignore_unknown_ids is True
+        with self._lock:
+            self.calls.append(("id", list(id)) if id is not None else ("external_id", list(external_id)))
+        by_xid = {x: i for i, (x, _, _) in SERIES.items()}
+        wanted = [i for i in (id or []) if i in SERIES] + [by_xid[x] for x in (external_id or []) if x in by_xid]
+        result = []
+        for i in wanted:
+            xid, ts, value = SERIES[i]
+            result.append(
+                SimpleNamespace(id=i, external_id=xid, timestamp=[ts] if ts else [], value=[value] if ts else [])
+            )
+        return result
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client():
+    return SimpleNamespace(config=SimpleNamespace(project="proj"), time_series=SimpleNamespace(data=_FakeData()))
+
+
+def test_get_batches_ids_and_external_ids():
+    client = _client()
+    cache = LatestValueCache(client, batch_size=2)
+    df = cache.get(ids=[1, 2, 3, 99], external_ids=["nor_pop"])
+    assert list(df.index) == [1, 2, 3, 99, "nor_pop"]
+    assert df.loc[1, "value"] == 5_530_000.0
+    assert df.loc[1, "timestamp"] == pd.Timestamp("2021-01-01", tz="UTC")
+    assert pd.isna(df.loc[3, "value"]) and pd.isna(df.loc[99, "value"])
+    assert df.loc["nor_pop", "id"] == 2
+    assert sorted(client.time_series.data.calls) == [
+        ("external_id", ["nor_pop"]),
+        ("id", [1, 2]),
+        ("id", [3, 99]),
+    ]
+
+
+def test_ttl_serves_from_cache_until_expiry():
+    client, clock = _client(), _Clock()
+    cache = LatestValueCache(client, ttl=10, clock=clock)
+    cache.get(ids=[1, 2])
+    clock.now = 5
+    assert cache.get_values(ids=[2, 1]) == {2: 5_400_000.0, 1: 5_530_000.0}
+    assert len(client.time_series.data.calls) == 1
+    assert cache.hits == 2
+    clock.now = 11
+    cache.get(ids=[1])
+    assert client.time_series.data.calls[-1] == ("id", [1])
+
+
+def test_invalidate():
+    client = _client()
+    cache = LatestValueCache(client)
+    cache.get(ids=[1, 2])
+    cache.invalidate(ids=[1])
+    cache.get(ids=[1, 2])
+    assert client.time_series.data.calls[-1] == ("id", [1])
+
+
+def test_names_require_resolver():
+    cache = LatestValueCache(_client())
+    with pytest.raises(ValueError):
+        cache.get(names=["Finland_population"])
+    resolver = SimpleNamespace(resolve_names=lambda names: {"Finland_population": 1})
+    df = LatestValueCache(_client(), resolver=resolver).get(names=["Finland_population", "Atlantis"])
+    assert df.loc["Finland_population", "value"] == 5_530_000.0
+    assert pd.isna(df.loc["Atlantis", "value"])
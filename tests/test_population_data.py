@@ -0,0 +1,79 @@
+"""Tests for population_data (uses the CSVs under data/, no CDF client required)."""
+import pandas as pd
+import pytest
+
+from population_data import (
+    DATA_DIR,
+    build_population_frames,
+    file_sha256,
+    reshape_populations,
+    rolling_average,
+    yoy_growth,
+)
+
+
+def _wide():
+    return pd.DataFrame(
+        {
+            "Country Name": ["Aruba", "World", "Albania"],
+            "Country Code": ["ABW", "WLD", "ALB"],
+            "2000": [100, 1000, 10],
+            "2001": [110, 1100, None],
+            "2002": [121, 1200, 12],
+        }
+    )
+
+
+def test_reshape_populations_filters_and_indexes_by_date():
+    """Countries not in the filter (e.g. regional aggregates) are dropped; index is year-start dates."""
+    df = reshape_populations(_wide(), countries=["Albania", "Aruba"], start_year=2001)
+    assert list(df.columns) == ["Aruba", "Albania"]
+    assert list(df.index) == [pd.Timestamp("2001-01-01"), pd.Timestamp("2002-01-01")]
+    assert df.loc["2002-01-01", "Aruba"] == 121.0
+
+
+def test_yoy_growth_keeps_gaps():
+    """Growth is a fraction and a missing year does not get forward-filled."""
+    growth = yoy_growth(reshape_populations(_wide()))
+    assert growth.loc["2001-01-01", "Aruba"] == pytest.approx(0.1)
+    assert pd.isna(growth.loc["2002-01-01", "Albania"])
+
+
+def test_rolling_average():
+    """Rolling mean is trailing and needs a full window by default."""
+    rolled = rolling_average(reshape_populations(_wide()), window=2)
+    assert pd.isna(rolled.iloc[0]["Aruba"])
+    assert rolled.loc["2001-01-01", "Aruba"] == pytest.approx(105.0)
+    partial = rolling_average(reshape_populations(_wide()), window=2, min_periods=0)
+    assert not pd.isna(partial.iloc[0]["Aruba"])
+
+
+def test_build_population_frames_matches_postprocessed_csv(tmp_path):
+    """Default output reproduces data/populations_postprocessed.csv."""
+    expected = pd.read_csv(DATA_DIR / "populations_postprocessed.csv", index_col=0, parse_dates=True)
+    frames = build_population_frames(cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(frames["population"], expected, check_index_type=False, check_freq=False)
+    # Growth for the first kept year uses 1989, which is outside the trimmed range.
+    assert frames["growth"].iloc[0].notna().any()
+
+
+def test_build_population_frames_uses_cache(tmp_path):
+    """Second call is served from the pickle keyed by the input file hashes."""
+    build_population_frames(cache_dir=tmp_path)
+    cached = list(tmp_path.glob("population_frames_*.pkl"))
+    assert len(cached) == 1
+    pd.to_pickle({"population": pd.DataFrame({"marker": [1]})}, cached[0])
+    assert "marker" in build_population_frames(cache_dir=tmp_path)["population"].columns
+
+
+def test_cache_key_changes_with_input(tmp_path):
+    """Editing an input CSV changes its hash, so the next build writes a new cache entry."""
+    src = tmp_path / "pop.csv"
+    _wide().to_csv(src, index=False)
+    cache_dir = tmp_path / "cache"
+    before = file_sha256(src)
+    build_population_frames(populations_path=src, start_year=None, rolling_window=2, cache_dir=cache_dir)
+    src.write_text(src.read_text() + "Aruba,ABW,1,2,3\n")
+    assert file_sha256(src) != before
+    build_population_frames(populations_path=src, start_year=None, rolling_window=2, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("population_frames_*.pkl"))) == 2
@@ -0,0 +1,127 @@
+"""Tests for rate_limiter (no CDF client required)."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limiter import (
+    AdaptiveLimiter,
+    get_limiter,
+    is_throttle_error,
+    limited_call,
+    limiter_stats,
+    reset_limiters,
+)
+
+
+class _ApiError(Exception):
+    """Stand-in for CogniteAPIError: only .code matters to the limiter."""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+def test_is_throttle_error():
+    """429 and 503 are throttles; other codes and plain exceptions are not."""
+    assert is_throttle_error(_ApiError(429))
+    assert is_throttle_error(_ApiError(503))
+    assert not is_throttle_error(_ApiError(400))
+    assert not is_throttle_error(ValueError("x"))
+
+
+def test_call_retries_throttles_and_halves_limit():
+    """A throttled call is retried, the limit is cut and the throttle is counted."""
+    limiter = AdaptiveLimiter("p", initial_limit=8, backoff_base=0)
+    outcomes = [_ApiError(429), _ApiError(503), "ok"]
+
+    def flaky():
+        out = outcomes.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+    assert limiter.call(flaky) == "ok"
+    stats = limiter.stats()
+    assert stats["throttles"] == 2
+    assert stats["successes"] == 1
+    assert stats["calls"] == 3
+    assert limiter.limit == 2
+
+
+def test_call_gives_up_after_max_retries():
+    """After max_retries the last throttle error is raised, not swallowed."""
+    limiter = AdaptiveLimiter("p", max_retries=1, backoff_base=0)
+    with pytest.raises(_ApiError):
+        limiter.call(lambda: (_ for _ in ()).throw(_ApiError(429)))
+    assert limiter.stats()["throttles"] == 2
+
+
+def test_non_throttle_error_is_not_retried():
+    """Other errors propagate immediately and do not change the limit."""
+    limiter = AdaptiveLimiter("p", initial_limit=4)
+    calls = []
+
+    def boom():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(boom)
+    assert len(calls) == 1
+    assert limiter.limit == 4
+    assert limiter.stats()["failures"] == 1
+
+
+def test_success_ramps_up_to_max_limit():
+    """Additive increase never exceeds max_limit."""
+    limiter = AdaptiveLimiter("p", initial_limit=1, max_limit=3)
+    for _ in range(50):
+        limiter.call(lambda: None)
+    assert limiter.limit == 3
+
+
+def test_slot_bounds_concurrency():
+    """No more than `limit` calls run at once."""
+    limiter = AdaptiveLimiter("p", initial_limit=2, max_limit=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+
+    threads = [threading.Thread(target=limiter.call, args=(work,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] <= 2
+    assert limiter.stats()["calls"] == 8
+
+
+def test_limiters_are_shared_per_project():
+    """limited_call uses one limiter per client.config.project."""
+    client_a = SimpleNamespace(config=SimpleNamespace(project="proj-a"))
+    client_b = SimpleNamespace(config=SimpleNamespace(project="proj-a"))
+    assert limited_call(client_a, lambda x: x + 1, 1) == 2
+    limited_call(client_b, lambda: None)
+    assert get_limiter("proj-a").stats()["calls"] == 2
+    assert list(limiter_stats()) == ["proj-a"]
+
+
+def test_invalid_limits_raise():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter("p", initial_limit=0)
@@ -0,0 +1,116 @@
+"""Tests for sequence_rows (fake client, no CDF required)."""
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from cognite.client.data_classes import SequenceRows
+
+from sequence_rows import (
+    insert_sequence_rows,
+    iter_sequence_dataframes,
+    row_ranges,
+    sequence_row_end,
+)
+
+
+class _FakeSequenceData:
+    def __init__(self, row_numbers):
+        self.rows = {r: [r * 10] for r in row_numbers}
+        self.retrieve_calls = []
+        self.insert_calls = []
+        self._lock = threading.Lock()
+
+    def retrieve_last_row(self, **ident):
+        last = [{"rowNumber": max(self.rows), "values": self.rows[max(self.rows)]}] if self.rows else []
+        return SequenceRows._load({"id": 1, "columns": [{"externalId": "value"}], "rows": last})
+
+    def retrieve_dataframe(self, start, end, column_external_ids=None, **ident):
+        with self._lock:
+            self.retrieve_calls.append((start, end))
+        index = [r for r in sorted(self.rows) if start <= r < end]
+        return pd.DataFrame({"value": [self.rows[r][0] for r in index]}, index=index)
+
+    def insert(self, rows, columns, **ident):
+        with self._lock:
+            self.insert_calls.append((list(rows), columns, ident))
+
+
+def _client(row_numbers=()):
+    return SimpleNamespace(
+        config=SimpleNamespace(project="proj"),
+        sequences=SimpleNamespace(data=_FakeSequenceData(row_numbers)),
+    )
+
+
+def test_row_ranges():
+    assert row_ranges(0, 5, 2) == [(0, 2), (2, 4), (4, 5)]
+    assert row_ranges(3, 3, 2) == []
+    with pytest.raises(ValueError):
+        row_ranges(0, 5, 0)
+
+
+def test_sequence_row_end():
+    assert sequence_row_end(_client([0, 1, 7]), external_id="s") == 8
+    assert sequence_row_end(_client([]), id=1) == 0
+
+
+def test_iter_sequence_dataframes_in_order_and_skips_gaps():
+    """Chunks come back in row order; empty ranges are not yielded."""
+    client = _client(list(range(0, 5)) + list(range(20, 23)))
+    chunks = list(iter_sequence_dataframes(client, external_id="s", chunk_size=5, max_workers=3))
+    assert [list(c.index) for c in chunks] == [[0, 1, 2, 3, 4], [20, 21, 22]]
+    assert sorted(client.sequences.data.retrieve_calls) == [(0, 5), (5, 10), (10, 15), (15, 20), (20, 23)]
+
+
+def test_iter_sequence_dataframes_requires_one_identifier():
+    with pytest.raises(ValueError):
+        list(iter_sequence_dataframes(_client([0]), id=1, external_id="s"))
+    with pytest.raises(ValueError):
+        list(iter_sequence_dataframes(_client([0])))
+
+
+def test_insert_sequence_rows_chunks_a_generator():
+    """A generator is consumed in chunks; every row is inserted exactly once."""
+    client = _client()
+    rows = ((i, [f"user{i}", i]) for i in range(25))
+    assert insert_sequence_rows(client, rows, ["user", "amount"], external_id="s", chunk_size=10, max_workers=2) == 25
+    calls = client.sequences.data.insert_calls
+    assert sorted(len(c[0]) for c in calls) == [5, 10, 10]
+    assert sorted(r[0] for c in calls for r in c[0]) == list(range(25))
+    assert all(c[1] == ["user", "amount"] and c[2] == {"external_id": "s"} for c in calls)
+
+
+def test_insert_sequence_rows_empty_iterable():
+    client = _client()
+    assert insert_sequence_rows(client, iter([]), ["a"], id=1) == 0
+    assert client.sequences.data.insert_calls == []
+
+
+def test_insert_sequence_rows_holds_at_most_max_workers_chunks():
+    """While inserts are blocked, no more than max_workers chunks are read from the iterable."""
+    client = _client()
+    release = threading.Event()
+    original_insert = client.sequences.data.insert
+
+    def blocking_insert(**kwargs):
+        release.wait(5)
+        original_insert(**kwargs)
+
+    client.sequences.data.insert = blocking_insert
+    pulled = []
+
+    def rows():
+        for i in range(100):
+            pulled.append(i)
+            yield (i, [i])
+
+    worker = threading.Thread(
+        target=insert_sequence_rows, args=(client, rows(), ["a"]), kwargs={"id": 1, "chunk_size": 10, "max_workers": 2}
+    )
+    worker.start()
+    worker.join(0.3)
+    assert len(pulled) <= 2 * 10
+    release.set()
+    worker.join(5)
+    assert sum(len(c[0]) for c in client.sequences.data.insert_calls) == 100
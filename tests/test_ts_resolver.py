@@ -0,0 +1,129 @@
+"""Tests for ts_resolver (fake client, no CDF required)."""
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from ts_resolver import TimeSeriesIdResolver
+
+
+def _ts(id, name, external_id):
+    return SimpleNamespace(id=id, name=name, external_id=external_id)
+
+
+class _FakeTimeSeries:
+    def __init__(self, items):
+        self.items = items
+        self.retrieve_calls = []
+        self.list_calls = []
+
+    def retrieve_multiple(self, external_ids, ignore_unknown_ids):
+        assert ignore_unknown_ids is True
+        self.retrieve_calls.append(list(external_ids))
+        return [t for t in self.items if t.external_id in external_ids]
+
+    def list(self, data_set_ids, advanced_filter, limit):
+        names = advanced_filter.dump()["in"]["values"]
+        self.list_calls.append((data_set_ids, names))
+        return [t for t in self.items if t.name in names]
+
+
+def _client(items, project="proj"):
+    return SimpleNamespace(config=SimpleNamespace(project=project), time_series=_FakeTimeSeries(items))
+
+
+ITEMS = [
+    _ts(1, "Finland_population", "fin_pop"),
+    _ts(2, "Norway_population", "nor_pop"),
+    _ts(3, "Dup", "dup_a"),
+    _ts(4, "Dup", "dup_b"),
+]
+
+
+def test_resolve_external_ids_batches_only_misses():
+    """Known ids are served from the LRU; unknown ones are batched and omitted if missing."""
+    client = _client(ITEMS)
+    resolver = TimeSeriesIdResolver(client, batch_size=2)
+    assert resolver.resolve_external_ids(["fin_pop", "nor_pop", "nope"]) == {"fin_pop": 1, "nor_pop": 2}
+    assert client.time_series.retrieve_calls == [["fin_pop", "nor_pop"], ["nope"]]
+    assert resolver.resolve_external_ids(["fin_pop", "dup_a"]) == {"fin_pop": 1, "dup_a": 3}
+    assert client.time_series.retrieve_calls[-1] == ["dup_a"]
+    assert resolver.hits == 1
+
+
+def test_resolve_names_skips_ambiguous():
+    client = _client(ITEMS)
+    resolver = TimeSeriesIdResolver(client, data_set_ids=[5])
+    assert resolver.resolve_names(["Finland_population", "Dup"]) == {"Finland_population": 1}
+    assert resolver.ambiguous_names == {"Dup"}
+    assert client.time_series.list_calls == [([5], ["Finland_population", "Dup"])]
+    with pytest.raises(KeyError):
+        resolver.resolve_name("Dup")
+
+
+def test_lru_evicts_oldest():
+    client = _client(ITEMS)
+    resolver = TimeSeriesIdResolver(client, maxsize=1)
+    resolver.resolve_external_ids(["fin_pop"])
+    resolver.resolve_external_ids(["nor_pop"])
+    resolver.resolve_external_ids(["fin_pop"])
+    assert len(client.time_series.retrieve_calls) == 3
+
+
+def test_disk_cache_round_trip(tmp_path):
+    """save() writes JSON that a new resolver for the same project loads without calling CDF."""
+    path = tmp_path / "ts_ids.json"
+    resolver = TimeSeriesIdResolver(_client(ITEMS), cache_path=path)
+    resolver.resolve_names(["Norway_population"])
+    resolver.save()
+    fresh_client = _client([])
+    assert TimeSeriesIdResolver(fresh_client, cache_path=path).resolve_name("Norway_population") == 2
+    assert fresh_client.time_series.list_calls == []
+    # A different project ignores the file.
+    assert TimeSeriesIdResolver(_client([], project="other"), cache_path=path).resolve_names(["Norway_population"]) == {}
+
+
+def test_disk_cache_names_require_same_data_sets(tmp_path):
+    """Names resolved under other data sets are not trusted; external ids still load."""
+    path = tmp_path / "ts_ids.json"
+    resolver = TimeSeriesIdResolver(_client(ITEMS), data_set_ids=[1], cache_path=path)
+    resolver.resolve_names(["Norway_population"])
+    resolver.resolve_external_ids(["fin_pop"])
+    resolver.save()
+    other = TimeSeriesIdResolver(_client([]), data_set_ids=[2], cache_path=path)
+    assert other.resolve_names(["Norway_population"]) == {}
+    assert other.resolve_external_ids(["fin_pop"]) == {"fin_pop": 1}
+    same = TimeSeriesIdResolver(_client([]), data_set_ids=[1], cache_path=path)
+    assert same.resolve_names(["Norway_population"]) == {"Norway_population": 2}
+
+
+def test_names_use_their_own_batch_size():
+    client = _client(ITEMS)
+    resolver = TimeSeriesIdResolver(client, batch_size=10, name_batch_size=1)
+    resolver.resolve_names(["Finland_population", "Norway_population"])
+    assert sorted(names for _, names in client.time_series.list_calls) == [["Finland_population"], ["Norway_population"]]
+
+
+def test_rename_columns_to_ids():
+    resolver = TimeSeriesIdResolver(_client(ITEMS))
+    df = pd.DataFrame({"Finland_population": [1.0], "Norway_population": [2.0]})
+    assert list(resolver.rename_columns_to_ids(df).columns) == [1, 2]
+    with pytest.raises(KeyError):
+        resolver.rename_columns_to_ids(df.assign(Atlantis=[0.0]))
+    assert list(resolver.rename_columns_to_ids(df.assign(Atlantis=[0.0]), strict=False).columns)[-1] == "Atlantis"
+
+
+def test_negative_entries_expire_and_ambiguity_clears():
+    """Ambiguous / unknown keys are not re-fetched until negative_ttl passes; a name that became unique resolves."""
+    now = [0.0]
+    client = _client(list(ITEMS))
+    resolver = TimeSeriesIdResolver(client, negative_ttl=60, clock=lambda: now[0])
+    assert resolver.resolve_names(["Dup", "Missing"]) == {}
+    assert resolver.resolve_names(["Dup", "Missing"]) == {}
+    assert len(client.time_series.list_calls) == 1
+    assert resolver.ambiguous_names == {"Dup"}
+    client.time_series.items = [t for t in client.time_series.items if t.id != 4]
+    now[0] = 61.0
+    assert resolver.resolve_names(["Dup"]) == {"Dup": 3}
+    assert resolver.ambiguous_names == set()
+    assert len(client.time_series.list_calls) == 2
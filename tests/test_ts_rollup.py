@@ -0,0 +1,132 @@
+"""Tests for ts_rollup (fake client, no CDF required)."""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from asset_cache import AssetHierarchyCache
+from ts_rollup import HierarchicalRollup, align_and_aggregate, leaf_series_by_asset
+
+
+def _asset(id, name, parent_id=None):
+    return SimpleNamespace(id=id, name=name, parent_id=parent_id, external_id=name.lower(), last_updated_time=1)
+
+
+ASSETS = [
+    _asset(1, "World"),
+    _asset(2, "Europe", 1),
+    _asset(3, "Asia", 1),
+    _asset(4, "Finland", 2),
+    _asset(5, "Norway", 2),
+    _asset(6, "Japan", 3),
+]
+
+
+class _FakeData:
+    def __init__(self, points):
+        self.points = points  # {ts_id: [(timestamp, value), ...]}
+        self.inserted = []
+
+    def retrieve(self, id, end, ignore_unknown_ids):
+        result = []
+        for query in id:
+            ts_id = query.identifier.as_primitive()
+            pts = [(t, v) for t, v in self.points.get(ts_id, []) if t >= query.start]
+            result.append(SimpleNamespace(id=ts_id, timestamp=[t for t, _ in pts], value=[v for _, v in pts]))
+        return result
+
+    def insert_multiple(self, items):
+        self.inserted.append(items)
+
+
+class _FakeTimeSeries:
+    def __init__(self, points):
+        self.data = _FakeData(points)
+        self.created = []
+
+    def retrieve_multiple(self, external_ids, ignore_unknown_ids):
+        return []
+
+    def create(self, items):
+        self.created.extend(items)
+
+
+def _setup(points, how="sum"):
+    client = SimpleNamespace(
+        config=SimpleNamespace(project="proj"),
+        assets=SimpleNamespace(list=lambda **kw: list(ASSETS)),
+        time_series=_FakeTimeSeries(points),
+    )
+    hierarchy = AssetHierarchyCache(client)
+    hierarchy.refresh()
+    return client, HierarchicalRollup(client, hierarchy, {4: 40, 5: 50, 6: 60}, how=how, batch_size=2)
+
+
+def test_align_and_aggregate_sum_and_mean():
+    a = (np.array([1, 2, 3]), np.array([1.0, 2.0, 3.0]))
+    b = (np.array([2, 4]), np.array([10.0, 40.0]))
+    ts, values = align_and_aggregate([a, b], "sum")
+    assert ts.tolist() == [1, 2, 3, 4]
+    assert values.tolist() == [1.0, 12.0, 3.0, 40.0]
+    assert align_and_aggregate([a, b], "mean")[1].tolist() == [1.0, 6.0, 3.0, 40.0]
+    assert len(align_and_aggregate([], "sum")[0]) == 0
+    with pytest.raises(ValueError):
+        align_and_aggregate([a], "max")
+
+
+def test_leaf_series_by_asset_skips_rollups_and_filters():
+    series = [
+        SimpleNamespace(id=1, asset_id=4, external_id=None, name="Finland_population"),
+        SimpleNamespace(id=2, asset_id=4, external_id=None, name="Finland_gdp"),
+        SimpleNamespace(id=3, asset_id=2, external_id="rollup:europe:sum", name="Europe (sum)"),
+        SimpleNamespace(id=4, asset_id=None, external_id=None, name="loose_population"),
+    ]
+    assert leaf_series_by_asset(series, lambda ts: ts.name.endswith("_population")) == {4: 1}
+
+
+def test_run_rolls_up_bottom_up_and_writes_batched():
+    points = {40: [(0, 5.0), (1, 6.0)], 50: [(0, 4.0)], 60: [(0, 100.0), (1, 110.0)]}
+    client, rollup = _setup(points)
+    summary = rollup.run()
+    assert summary["name"].tolist() == ["World", "Europe", "Asia"]
+    df = rollup.to_pandas()
+    assert df["Europe"].tolist() == [9.0, 6.0]
+    assert df["World"].tolist() == [109.0, 116.0]
+    assert {ts.external_id for ts in client.time_series.created} == {"rollup:world:sum", "rollup:europe:sum", "rollup:asia:sum"}
+    inserted = client.time_series.data.inserted
+    assert [len(batch) for batch in inserted] == [2, 1]
+
+
+def test_incremental_run_only_updates_affected_parents():
+    points = {40: [(0, 5.0)], 50: [(0, 4.0)], 60: [(0, 100.0)]}
+    client, rollup = _setup(points)
+    rollup.run()
+    points[60].append((10, 120.0))
+    summary = rollup.run()
+    assert set(summary["name"]) == {"Asia", "World"}
+    last_write = [item for batch in client.time_series.data.inserted[-1:] for item in batch]
+    assert {item["external_id"]: item["datapoints"] for item in last_write} == {
+        "rollup:asia:sum": [(10, 120.0)],
+        "rollup:world:sum": [(10, 120.0)],
+    }
+    assert rollup.run().empty
+
+
+def test_mean_uses_direct_children():
+    points = {40: [(0, 2.0)], 50: [(0, 4.0)], 60: [(0, 9.0)]}
+    _, rollup = _setup(points, how="mean")
+    rollup.run(write=False)
+    df = rollup.to_pandas()
+    assert df["Europe"].tolist() == [3.0]
+    assert df["World"].tolist() == [6.0]
+
+
+def test_leaf_series_by_asset_skips_custom_prefix_rollups():
+    """Series from a roll-up with a custom prefix are skipped by their metadata marker or the prefix."""
+    series = [
+        SimpleNamespace(id=1, asset_id=4, external_id="fin_pop", name="Finland_population", metadata={}),
+        SimpleNamespace(id=2, asset_id=2, external_id="agg/europe:sum", name="Europe (sum)", metadata={"rollup": "sum"}),
+        SimpleNamespace(id=3, asset_id=3, external_id="agg/asia:sum", name="Asia (sum)", metadata=None),
+    ]
+    assert leaf_series_by_asset(series) == {4: 1, 3: 3}
+    assert leaf_series_by_asset(series, external_id_prefix="agg/") == {4: 1}
@@ -0,0 +1,119 @@
+"""Tests for workbook_apply (no CDF client required)."""
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from cognite.client.data_classes.capabilities import Capability
+
+from cognite_groups_export import build_customer_dataframe, get_group_capability_keys, write_groups_to_excel
+from workbook_apply import (
+    apply_capability_plan,
+    apply_groups_workbook,
+    capability_templates,
+    plan_capability_changes,
+    read_groups_workbook,
+    split_capability_actions,
+)
+
+ASSETS_RW = {"assetsAcl": {"actions": ["READ", "WRITE"], "scope": {"all": {}}}}
+EVENTS_R = {"eventsAcl": {"actions": ["READ"], "scope": {"all": {}}}}
+
+
+def _group(gid, name, *caps):
+    return SimpleNamespace(id=gid, name=name, source_id="", capabilities=[Capability.load(c) for c in caps])
+
+
+def _groups():
+    return [_group(1, "readers", EVENTS_R), _group(2, "writers", ASSETS_RW)]
+
+
+def _sheet(groups):
+    return build_customer_dataframe(groups, ["assets:read", "assets:write", "events:read"])
+
+
+def test_plan_is_empty_for_unedited_sheet():
+    groups = _groups()
+    assert plan_capability_changes(_sheet(groups), groups).empty
+
+
+def test_plan_detects_adds_and_removes():
+    groups = _groups()
+    edited = _sheet(groups)
+    edited.loc[edited["Group ID"] == 1, "assets:read"] = "y "
+    edited.loc[edited["Group ID"] == 2, "assets:write"] = "N"
+    plan = plan_capability_changes(edited, groups)
+    assert plan[["Group ID", "change", "capability"]].values.tolist() == [
+        [1, "add", "assets:read"],
+        [2, "remove", "assets:write"],
+    ]
+    assert plan["Group Name"].tolist() == ["readers", "writers"]
+
+
+def test_plan_rejects_non_yn_values():
+    groups = _groups()
+    edited = _sheet(groups)
+    edited["events:read"] = "read, write"
+    with pytest.raises(ValueError):
+        plan_capability_changes(edited, groups)
+
+
+def test_plan_ignores_columns_missing_from_workbook():
+    """A capability not in the workbook (created after export) is never removed."""
+    groups = _groups()
+    edited = _sheet(groups).drop(columns=["events:read"])
+    assert plan_capability_changes(edited, groups).empty
+
+
+def test_split_and_templates():
+    cap = Capability.load(ASSETS_RW)
+    assert len(split_capability_actions(cap)) == 2
+    assert set(capability_templates(_groups())) == {"assets:read", "assets:write", "events:read"}
+
+
+def test_apply_plan_batches_updates():
+    groups = _groups()
+    edited = _sheet(groups)
+    edited.loc[edited["Group ID"] == 1, ["assets:read", "events:read"]] = ["Y", "N"]
+    edited.loc[edited["Group ID"] == 2, "assets:write"] = "N"
+    plan = plan_capability_changes(edited, groups)
+    with pytest.MonkeyPatch.context() as mp:
+        calls = []
+        mp.setattr("workbook_apply.update_groups_capabilities", lambda client, updates, **kwargs: calls.append(updates))
+        assert (apply_capability_plan(None, groups, plan)["status"] == "planned").all()
+        assert calls == []
+        result = apply_capability_plan(None, groups, plan, dry_run=False)
+    assert len(calls) == 1
+    updated = {gid: get_group_capability_keys(SimpleNamespace(capabilities=caps)) for gid, caps in calls[0].items()}
+    assert updated == {1: {"assets:read"}, 2: {"assets:read"}}
+    assert (result["status"] == "applied").all()
+
+
+def test_apply_plan_reports_keys_without_template():
+    groups = _groups()
+    plan = pd.DataFrame([[1, "readers", "add", "files:read"]], columns=["Group ID", "Group Name", "change", "capability"])
+    assert apply_capability_plan(None, groups, plan)["status"].tolist() == ["no template"]
+
+
+def test_read_groups_workbook_round_trip(tmp_path):
+    groups = _groups()
+    path = tmp_path / "groups.xlsx"
+    write_groups_to_excel({"cust": _sheet(groups), "down": None}, path)
+    sheets = read_groups_workbook(path)
+    assert list(sheets) == ["cust"]
+    assert plan_capability_changes(sheets["cust"], groups).empty
+
+
+def test_apply_groups_workbook_forwards_compact(tmp_path, monkeypatch):
+    groups = _groups()
+    edited = _sheet(groups)
+    edited.loc[edited["Group ID"] == 2, "assets:write"] = "N"
+    path = tmp_path / "groups.xlsx"
+    write_groups_to_excel({"cust": edited}, path)
+    client = SimpleNamespace(
+        config=SimpleNamespace(project="proj"), iam=SimpleNamespace(groups=SimpleNamespace(list=lambda all: groups))
+    )
+    calls = []
+    monkeypatch.setattr("workbook_apply.update_groups_capabilities", lambda client, updates, **kwargs: calls.append(kwargs))
+    result = apply_groups_workbook(client, "cust", path, dry_run=False, compact=True)
+    assert result["status"].tolist() == ["applied"]
+    assert calls[0]["compact"] is True
@@ -0,0 +1,201 @@
+"""
+Local, in-memory cache of an asset hierarchy (per data set) with indexes by name, external id and
+parent id, plus subtree traversal. Replaces repeated
+`client.assets.list(..., limit=-1).to_pandas()[['name','id']].set_index('name')` and
+`retrieve_subtree` calls in the notebooks with dictionary lookups.
+refresh() is incremental: after the first full listing it only fetches assets whose
+lastUpdatedTime is at or after the newest one already cached.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Sequence
+
+import pandas as pd
+
+from rate_limiter import limited_call
+
+
+class AssetHierarchyCache:
+    """
+    Cached asset hierarchy for one project, optionally restricted to data sets.
+    client: CogniteClient
+    data_set_ids / data_set_external_ids: restrict the cache to these data sets (None: all assets).
+    Incremental refreshes cannot see deletions; call refresh(full=True) after deleting assets.
+    """
+
+    def __init__(
+        self,
+        client,
+        data_set_ids: int | Sequence[int] | None = None,
+        data_set_external_ids: str | Sequence[str] | None = None,
+        partitions: int | None = None,
+    ):
+        self.client = client
+        self.data_set_ids = data_set_ids
+        self.data_set_external_ids = data_set_external_ids
+        self.partitions = partitions
+        self.assets: dict[int, object] = {}
+        self._by_name: dict[str, set[int]] = {}
+        self._by_external_id: dict[str, int] = {}
+        self._children: dict[int | None, set[int]] = {}
+        self._watermark: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __contains__(self, asset_id: int) -> bool:
+        return asset_id in self.assets
+
+    @property
+    def last_updated_time(self) -> int | None:
+        """Newest lastUpdatedTime (ms since epoch) seen so far; None before the first refresh."""
+        return self._watermark
+
+    def _index(self, asset) -> None:
+        self._by_name.setdefault(asset.name, set()).add(asset.id)
+        if asset.external_id:
+            self._by_external_id[asset.external_id] = asset.id
+        self._children.setdefault(asset.parent_id, set()).add(asset.id)
+
+    def _unindex(self, asset) -> None:
+        self._by_name.get(asset.name, set()).discard(asset.id)
+        if asset.external_id and self._by_external_id.get(asset.external_id) == asset.id:
+            del self._by_external_id[asset.external_id]
+        self._children.get(asset.parent_id, set()).discard(asset.id)
+
+    def _upsert(self, asset) -> None:
+        """Insert or replace one asset, keeping the indexes consistent when name/parent changed."""
+        old = self.assets.get(asset.id)
+        if old is not None:
+            self._unindex(old)
+        self.assets[asset.id] = asset
+        self._index(asset)
+        updated = getattr(asset, "last_updated_time", None)
+        if updated is not None and (self._watermark is None or updated > self._watermark):
+            self._watermark = updated
+
+    def _clear(self) -> None:
+        self.assets.clear()
+        self._by_name.clear()
+        self._by_external_id.clear()
+        self._children.clear()
+        self._watermark = None
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Fetch new and changed assets and update the indexes. Returns the number of assets fetched.
+        full: drop the cache and list everything again (picks up deletions).
+        """
+        if full:
+            self._clear()
+        kwargs: dict = {
+            "data_set_ids": self.data_set_ids,
+            "data_set_external_ids": self.data_set_external_ids,
+            "partitions": self.partitions,
+            "limit": -1,
+        }
+        if self._watermark is not None:
+            # Inclusive lower bound: re-fetching assets at the boundary is harmless, missing one is not.
+            kwargs["last_updated_time"] = {"min": self._watermark}
+        fetched = limited_call(self.client, self.client.assets.list, **kwargs)
+        for asset in fetched:
+            self._upsert(asset)
+        return len(fetched)
+
+    def get(self, asset_id: int):
+        """Asset by internal id (KeyError if not cached)."""
+        return self.assets[asset_id]
+
+    def get_by_external_id(self, external_id: str):
+        """Asset by external id (KeyError if not cached)."""
+        return self.assets[self._by_external_id[external_id]]
+
+    def ids_for_name(self, name: str) -> list[int]:
+        """All asset ids with this exact name (names are not unique in CDF)."""
+        return sorted(self._by_name.get(name, ()))
+
+    def id_for_name(self, name: str) -> int:
+        """The single asset id with this name. KeyError if none, ValueError if the name is ambiguous."""
+        ids = self.ids_for_name(name)
+        if not ids:
+            raise KeyError(name)
+        if len(ids) > 1:
+            raise ValueError(f"Asset name {name!r} is ambiguous: ids {ids}")
+        return ids[0]
+
+    def name_to_id(self) -> dict[str, int]:
+        """{name: id} for uniquely named assets (same mapping the notebooks build with set_index('name'))."""
+        return {name: next(iter(ids)) for name, ids in self._by_name.items() if len(ids) == 1}
+
+    def roots(self) -> list:
+        """Assets without a parent."""
+        return [self.assets[i] for i in sorted(self._children.get(None, ()))]
+
+    def children(self, asset_id: int) -> list:
+        """Direct children of an asset."""
+        return [self.assets[i] for i in sorted(self._children.get(asset_id, ()))]
+
+    def subtree(self, asset_id: int, include_root: bool = True, max_depth: int | None = None) -> list:
+        """
+        Breadth-first list of the asset and its descendants (like assets.retrieve_subtree, but local).
+        max_depth: 1 returns the asset and its children, None walks the whole subtree.
+        """
+        result = [self.assets[asset_id]] if include_root else []
+        queue = deque([(asset_id, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child_id in sorted(self._children.get(current, ())):
+                result.append(self.assets[child_id])
+                queue.append((child_id, depth + 1))
+        return result
+
+    def ancestors(self, asset_id: int) -> list:
+        """Parent, grandparent, ... up to the root (only those present in the cache)."""
+        result = []
+        parent_id = self.assets[asset_id].parent_id
+        while parent_id is not None and parent_id in self.assets:
+            parent = self.assets[parent_id]
+            result.append(parent)
+            parent_id = parent.parent_id
+        return result
+
+    def to_pandas(self, columns: Iterable[str] = ("id", "external_id", "name", "parent_id")) -> pd.DataFrame:
+        """Cached assets as a DataFrame with the requested attribute columns."""
+        cols = list(columns)
+        return pd.DataFrame([{c: getattr(a, c, None) for c in cols} for a in self.assets.values()], columns=cols)
+
+
+_CACHES: dict[tuple, AssetHierarchyCache] = {}
+
+
+def _key_part(value) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, (str, int)):
+        return (value,)
+    return tuple(sorted(value))
+
+
+def get_asset_cache(
+    client,
+    data_set_ids: int | Sequence[int] | None = None,
+    data_set_external_ids: str | Sequence[str] | None = None,
+    refresh: bool = True,
+) -> AssetHierarchyCache:
+    """
+    Shared cache per (project, data sets). Created and fully loaded on first use; later calls only
+    do an incremental refresh (or none with refresh=False).
+    """
+    key = (str(client.config.project), _key_part(data_set_ids), _key_part(data_set_external_ids))
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = _CACHES[key] = AssetHierarchyCache(client, data_set_ids, data_set_external_ids)
+        cache.refresh()
+    else:
+        cache.client = client
+        if refresh:
+            cache.refresh()
+    return cache
@@ -0,0 +1,172 @@
+"""
+Bulk cleanup of everything under a data set and/or external-id prefix (e.g. the training data
+created by 3_Create_Update_Insert.ipynb), in dependency-safe order:
+relationships -> events / files / sequences / time series -> assets (leaves before roots).
+Each resource type is collected with one filtered list call and deleted in concurrent batches
+through the project's shared limiter. cleanup(..., dry_run=True) only reports counts.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import pandas as pd
+
+from rate_limiter import limited_call
+
+# Delete order: relationships point at the others; assets go last because everything hangs off them.
+DELETE_ORDER = ("relationships", "events", "files", "sequences", "time_series", "assets")
+
+# Max ids per delete request accepted by CDF for these resource types.
+DEFAULT_BATCH_SIZE = 1000
+
+# Relationship list filters accept at most this many source/target external ids.
+_RELATIONSHIP_FILTER_LIMIT = 1000
+
+
+def _chunks(items: Sequence, size: int) -> list[Sequence]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _api(client, resource: str):
+    return getattr(client, resource)
+
+
+def collect_cleanup_targets(
+    client,
+    data_set_ids: int | Sequence[int] | None = None,
+    data_set_external_ids: str | Sequence[str] | None = None,
+    external_id_prefix: str | None = None,
+    partitions: int | None = None,
+) -> dict[str, list]:
+    """
+    List everything matching the filters: {resource_type: [resource objects]} in DELETE_ORDER.
+    Resources must match every filter given. Relationships have no external-id prefix filter, so
+    with a prefix they are kept if their own external id has the prefix or either endpoint is one
+    of the collected resources.
+    """
+    if data_set_ids is None and data_set_external_ids is None and not external_id_prefix:
+        raise ValueError("Refusing to clean up without a data set or external_id_prefix filter.")
+    data_set_filter = {"data_set_ids": data_set_ids, "data_set_external_ids": data_set_external_ids}
+    targets: dict[str, list] = {}
+    for resource in DELETE_ORDER[1:]:
+        list_fn = _api(client, resource).list
+        kwargs = dict(data_set_filter, external_id_prefix=external_id_prefix, partitions=partitions, limit=-1)
+        targets[resource] = list(limited_call(client, list_fn, **kwargs))
+    relationships = _collect_relationships(client, targets, data_set_filter, external_id_prefix)
+    return {"relationships": relationships, **targets}
+
+
+def _collect_relationships(client, targets: dict[str, list], data_set_filter: dict, prefix: str | None) -> list:
+    """Relationships in the data set(s), or attached to collected resources when only a prefix is given."""
+    has_data_set = any(v is not None for v in data_set_filter.values())
+    if has_data_set:
+        candidates = list(limited_call(client, client.relationships.list, **data_set_filter, limit=-1))
+    else:
+        endpoints = sorted({r.external_id for items in targets.values() for r in items if r.external_id})
+        found: dict[str, object] = {}
+        for chunk in _chunks(endpoints, _RELATIONSHIP_FILTER_LIMIT):
+            for side in ("source_external_ids", "target_external_ids"):
+                for rel in limited_call(client, client.relationships.list, **{side: list(chunk)}, limit=-1):
+                    found[rel.external_id] = rel
+        candidates = list(found.values())
+    if not prefix:
+        return candidates
+    endpoints = {r.external_id for items in targets.values() for r in items if r.external_id}
+    return [
+        rel
+        for rel in candidates
+        if rel.external_id.startswith(prefix) or rel.source_external_id in endpoints or rel.target_external_id in endpoints
+    ]
+
+
+def asset_delete_levels(assets: Sequence) -> list[list[int]]:
+    """
+    Group asset ids by depth within the collected set, deepest first, so each level only has
+    leaves once the previous levels are gone.
+    """
+    parents = {a.id: a.parent_id for a in assets}
+    depth: dict[int, int] = {}
+
+    def depth_of(asset_id: int) -> int:
+        chain = []
+        current = asset_id
+        while current not in depth and parents.get(current) in parents:
+            chain.append(current)
+            current = parents[current]
+        base = depth.setdefault(current, 0)
+        for offset, node in enumerate(reversed(chain), start=1):
+            depth[node] = base + offset
+        return depth[asset_id]
+
+    levels: dict[int, list[int]] = {}
+    for asset_id in parents:
+        levels.setdefault(depth_of(asset_id), []).append(asset_id)
+    return [sorted(levels[d]) for d in sorted(levels, reverse=True)]
+
+
+def _delete_batches(client, resource: str, identifiers: list, batch_size: int, max_workers: int, **extra) -> None:
+    """Delete identifiers in concurrent batches (external ids for relationships, ids otherwise)."""
+    if not identifiers:
+        return
+    key = "external_id" if resource == "relationships" else "id"
+    delete = _api(client, resource).delete
+
+    def run(batch):
+        limited_call(client, delete, **{key: list(batch)}, ignore_unknown_ids=True, **extra)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(run, _chunks(identifiers, batch_size)))
+
+
+def cleanup(
+    client,
+    data_set_ids: int | Sequence[int] | None = None,
+    data_set_external_ids: str | Sequence[str] | None = None,
+    external_id_prefix: str | None = None,
+    dry_run: bool = True,
+    recursive_assets: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    partitions: int | None = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Delete everything matching the filters (see collect_cleanup_targets) in DELETE_ORDER.
+    dry_run: only count; nothing is deleted.
+    partitions: parallel partitions for the list calls (large data sets).
+    verbose: print what would be / was deleted per resource type.
+    recursive_assets: delete only the top-most collected assets with recursive=True (fewer calls,
+    but also removes descendants outside the filter). Default deletes level by level, leaves first.
+    Returns a DataFrame with one row per resource type: count and whether it was deleted.
+    """
+    targets = collect_cleanup_targets(client, data_set_ids, data_set_external_ids, external_id_prefix, partitions)
+    summary = pd.DataFrame(
+        {
+            "resource": list(targets),
+            "count": [len(items) for items in targets.values()],
+            "deleted": [False] * len(targets),
+        }
+    )
+    if dry_run:
+        if verbose:
+            for resource, items in targets.items():
+                print(f"  [dry run] Would delete {len(items)} {resource}")
+        return summary
+
+    for resource, items in targets.items():
+        if resource == "relationships":
+            _delete_batches(client, resource, [r.external_id for r in items], batch_size, max_workers)
+        elif resource == "assets" and recursive_assets:
+            collected = {a.id for a in items}
+            tops = [a.id for a in items if a.parent_id not in collected]
+            _delete_batches(client, resource, tops, batch_size, max_workers, recursive=True)
+        elif resource == "assets":
+            for level in asset_delete_levels(items):
+                _delete_batches(client, resource, level, batch_size, max_workers)
+        else:
+            _delete_batches(client, resource, [r.id for r in items], batch_size, max_workers)
+        summary.loc[summary["resource"] == resource, "deleted"] = True
+        if verbose:
+            print(f"  Deleted {len(items)} {resource}")
+    return summary
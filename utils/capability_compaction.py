@@ -0,0 +1,109 @@
+"""
+Compact a group's capabilities before update or backup: merge entries of the same ACL that can be
+expressed as one, without granting anything new.
+- Actions already granted by an AllScope entry of the same ACL are dropped from scoped entries
+  (and scoped entries left without actions disappear).
+- Entries with an identical scope are merged into one with the union of their actions.
+- Entries with the same actions and the same id-list scope kind (datasetScope ids, idScope ids,
+  assetRootIdScope rootIds, spaceIdScope spaceIds, ...) are merged into one with the union of ids.
+Works on capability dicts as dumped by Capability.dump(camel_case=True) (the backup JSON format).
+"""
+from __future__ import annotations
+
+import json
+
+_ALL_SCOPE = "all"
+
+
+def _scope_parts(scope: dict | None) -> tuple[str, dict]:
+    """(scope kind, scope body); a missing scope is AllScope."""
+    if not scope:
+        return _ALL_SCOPE, {}
+    (kind, body), = scope.items()
+    return kind, body or {}
+
+
+def _id_list_field(body: dict) -> str | None:
+    """Name of the single list-of-scalars field in a scope body (e.g. "ids"), if that is all it has."""
+    if len(body) != 1:
+        return None
+    (field, value), = body.items()
+    if isinstance(value, list) and all(not isinstance(v, (dict, list)) for v in value):
+        return field
+    return None
+
+
+def _sorted_unique(values) -> list:
+    return sorted(set(values), key=lambda v: (str(type(v)), v))
+
+
+def _scope_key(kind: str, body: dict) -> str:
+    field = _id_list_field(body)
+    if field is not None:
+        body = {field: _sorted_unique(body[field])}
+    return json.dumps({kind: body}, sort_keys=True)
+
+
+def _compact_acl(entries: list[tuple[frozenset, str, dict]]) -> list[tuple[frozenset, str, dict]]:
+    """Compact (actions, scope kind, scope body) entries of one ACL until nothing more merges."""
+    all_actions = frozenset().union(*(a for a, kind, _ in entries if kind == _ALL_SCOPE))
+    current = []
+    for actions, kind, body in entries:
+        if kind != _ALL_SCOPE:
+            actions = actions - all_actions
+            if not actions:
+                continue
+            current.append((actions, kind, body))
+    if all_actions:
+        current.append((all_actions, _ALL_SCOPE, {}))
+
+    while True:
+        # Same scope -> union of actions.
+        by_scope: dict[str, tuple[frozenset, str, dict]] = {}
+        for actions, kind, body in current:
+            key = _scope_key(kind, body)
+            prev = by_scope.get(key)
+            by_scope[key] = (actions | prev[0], kind, body) if prev else (actions, kind, body)
+        # Same actions and same id-list scope kind -> union of ids.
+        merged: dict[tuple, tuple[frozenset, str, dict]] = {}
+        for actions, kind, body in by_scope.values():
+            field = _id_list_field(body)
+            if field is None:
+                merged[(actions, _scope_key(kind, body))] = (actions, kind, body)
+                continue
+            key = (actions, kind, field)
+            prev = merged.get(key)
+            ids = body[field] + (prev[2][field] if prev else [])
+            merged[key] = (actions, kind, {field: _sorted_unique(ids)})
+        result = list(merged.values())
+        if len(result) == len(current):
+            return result
+        current = result
+
+
+def compact_capability_dicts(capabilities: list[dict]) -> list[dict]:
+    """
+    Compacted copy of capability dicts ({"assetsAcl": {"actions": [...], "scope": {...}}, ...}).
+    Output is sorted by ACL name and scope, with sorted actions and ids, so it is also stable for
+    hashing and diffing.
+    """
+    by_acl: dict[str, list[tuple[frozenset, str, dict]]] = {}
+    for cap in capabilities:
+        (acl_name, body), = cap.items()
+        kind, scope_body = _scope_parts(body.get("scope"))
+        by_acl.setdefault(acl_name, []).append((frozenset(body.get("actions") or []), kind, scope_body))
+
+    result = []
+    for acl_name in sorted(by_acl):
+        entries = _compact_acl(by_acl[acl_name])
+        for actions, kind, body in sorted(entries, key=lambda e: (e[1] != _ALL_SCOPE, _scope_key(e[1], e[2]))):
+            result.append({acl_name: {"actions": sorted(actions), "scope": json.loads(_scope_key(kind, body))}})
+    return result
+
+
+def compact_capabilities(capabilities: list) -> list:
+    """Compacted copy of Capability objects (round-trips through compact_capability_dicts)."""
+    from cognite.client.data_classes.capabilities import Capability
+
+    dicts = compact_capability_dicts([c.dump(camel_case=True) for c in capabilities])
+    return [Capability.load(d, allow_unknown=True) for d in dicts]
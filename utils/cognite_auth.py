@@ -1,5 +1,8 @@
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from cognite.client import ClientConfig, CogniteClient
@@ -10,6 +13,15 @@ DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / "cognite_auth_config.jso
 
 _CLIENT_NAME = "Cognite Academy course taker"
 
+# With background refresh, tokens are renewed this long before expiry (MSAL's own silent-refresh
+# window is 5 minutes, so a larger margin would not yield a newer token for interactive auth).
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+# How often the background thread checks tokens; must be well below the margin.
+DEFAULT_REFRESH_INTERVAL_SECONDS = 60
+
+# OIDC meta-scopes MSAL adds itself and rejects in token requests.
+_OIDC_SCOPES = frozenset({"openid", "profile", "email", "offline_access"})
+
 
 def load_customer_configs() -> dict:
     config_path = Path(os.environ.get(CONFIG_ENV_VAR_NAME, str(DEFAULT_CONFIG_PATH)))
@@ -25,6 +37,19 @@ def load_customer_configs() -> dict:
 CUSTOMER_CONFIGS = load_customer_configs()
 
 
+def resolve_customers(customers=None) -> list[str]:
+    """Normalize a customer argument: None -> all configured customers, str -> [str], iterable -> list."""
+    if customers is None:
+        customer_list = list(CUSTOMER_CONFIGS.keys())
+    elif isinstance(customers, str):
+        customer_list = [customers]
+    else:
+        customer_list = list(customers)
+    if not customer_list:
+        raise ValueError("No customers specified.")
+    return customer_list
+
+
 def _base_url(config: dict) -> str:
     """Build CDF base URL from customer config."""
     return f"https://{config['cdf_cluster']}.cognitedata.com"
@@ -57,12 +82,25 @@ def _get_config_and_cache(customer, token_cache_path):
     return config, cache_path
 
 
-def interactive_client(customer, token_cache_path=None, redirect_port=53000):
+def _leeway_kwargs(background_refresh: bool) -> dict:
+    """Credential kwargs so tokens count as due for refresh early enough for the background thread."""
+    return {"token_expiry_leeway_seconds": DEFAULT_REFRESH_MARGIN_SECONDS} if background_refresh else {}
+
+
+def _register_background_refresh(client: CogniteClient, customer, background_refresh: bool) -> CogniteClient:
+    if background_refresh:
+        default_token_refresher().register(customer, client)
+    return client
+
+
+def interactive_client(customer, token_cache_path=None, redirect_port=53000, *, background_refresh=False):
     """
     Instantiate CogniteClient using the interactive (browser) OAuth flow.
     Requires a free local redirect port (default 53000). On WSL, port 53000
     is often taken by wslrelay.exe; use device_code_client() instead if you
     cannot change the app registration redirect URIs.
+    background_refresh: renew the token in a background thread before it expires
+    (see TokenRefresher), so long batch jobs never block on auth.
     """
     config, cache_path = _get_config_and_cache(customer, token_cache_path)
     base_url = _base_url(config)
@@ -72,17 +110,19 @@ def interactive_client(customer, token_cache_path=None, redirect_port=53000):
         scopes=[f"{base_url}/.default"],
         redirect_port=redirect_port,
         token_cache_path=cache_path,
+        **_leeway_kwargs(background_refresh),
     )
-    return _create_client(config, credentials)
+    return _register_background_refresh(_create_client(config, credentials), customer, background_refresh)
 
 
-def device_code_client(customer, token_cache_path=None):
+def device_code_client(customer, token_cache_path=None, *, background_refresh=False):
     """
     Instantiate CogniteClient using the device-code OAuth flow. No local port
     is used: you get a code and URL, open the URL in a browser, enter the code,
     then the client continues. Use this when the interactive redirect port
     (53000) is in use (e.g. by wslrelay.exe) and you cannot add other redirect
     URIs to the app registration.
+    background_refresh: renew the token in a background thread before it expires.
     """
     config, cache_path = _get_config_and_cache(customer, token_cache_path)
     credentials = OAuthDeviceCode.default_for_azure_ad(
@@ -90,26 +130,180 @@ def device_code_client(customer, token_cache_path=None):
         client_id=config["client_id"],
         cdf_cluster=config["cdf_cluster"],
         token_cache_path=cache_path,
+        **_leeway_kwargs(background_refresh),
     )
-    return _create_client(config, credentials)
+    return _register_background_refresh(_create_client(config, credentials), customer, background_refresh)
 
 
-def client_with_fallback(customer, token_cache_path=None, *, verbose=False):
+def client_with_fallback(customer, token_cache_path=None, *, verbose=False, background_refresh=False):
     """
     Try device-code auth first, then interactive. Returns a CogniteClient.
     Never raises None: if both methods fail, raises the last exception or
     RuntimeError("Authentication failed"). Use in notebooks to avoid
     invalid "raise last_exc" when last_exc can be None.
+    background_refresh: passed on to the chosen client factory.
     """
     last_exc = None
     for use_device_code in (True, False):
         try:
             if use_device_code:
-                return device_code_client(customer, token_cache_path)
-            return interactive_client(customer, token_cache_path)
+                return device_code_client(customer, token_cache_path, background_refresh=background_refresh)
+            return interactive_client(customer, token_cache_path, background_refresh=background_refresh)
         except Exception as e:
             last_exc = e
             if verbose and use_device_code:
                 print(f"Device-code failed ({e}), trying interactive...")
             continue
     raise last_exc if last_exc is not None else RuntimeError("Authentication failed")
+
+
+def _msal_app(credentials):
+    """The SDK credential's MSAL PublicClientApplication (private attribute, None if not found)."""
+    for cls in (OAuthDeviceCode, OAuthInteractive):
+        if isinstance(credentials, cls):
+            return getattr(credentials, f"_{cls.__name__}__app", None)
+    return None
+
+
+def _renew_silently(credentials) -> None:
+    """
+    Make sure the MSAL cache holds a usable access token, using only the cache (no prompt), so the
+    following authorization_header() call cannot fall back to a device-code or browser flow.
+    Raises RuntimeError when that is not possible (no cached account / refresh token, or the
+    refresh token was rejected). Other credential types refresh without prompts and are left alone.
+    """
+    if not isinstance(credentials, (OAuthDeviceCode, OAuthInteractive)):
+        return
+    app = _msal_app(credentials)
+    if app is None:
+        raise RuntimeError("Skipped background refresh: no MSAL token cache on the credentials.")
+    scopes = [s for s in credentials.scopes if s not in _OIDC_SCOPES]
+    if isinstance(credentials, OAuthInteractive):
+        accounts = app.get_accounts()
+        if not accounts:
+            raise RuntimeError("Skipped background refresh: no cached account; sign in again on the request path.")
+        result = app.acquire_token_silent_with_error(scopes, account=accounts[0])
+    else:
+        # Same order as OAuthDeviceCode: a still-valid cached access token, then a refresh token.
+        cache = app.token_cache
+        query = {"client_id": credentials.client_id}
+        now = time.time()
+        for token in cache.search(cache.CredentialType.ACCESS_TOKEN, query=query):
+            if int(token.get("expires_on", 0)) - now - credentials.token_expiry_leeway_seconds > 0:
+                return
+        refresh_token = next(iter(cache.search(cache.CredentialType.REFRESH_TOKEN, query=query)), None)
+        if refresh_token is None:
+            raise RuntimeError("Skipped background refresh: no cached refresh token; sign in again on the request path.")
+        # The new tokens are written to the cache, where authorization_header() picks them up.
+        result = app.client.obtain_token_by_refresh_token(
+            refresh_token, rt_getter=lambda rt: rt["secret"], scope=" ".join(scopes)
+        )
+    if not isinstance(result, dict) or "access_token" not in result:
+        detail = result.get("error_description") or result.get("error") if isinstance(result, dict) else None
+        raise RuntimeError(f"Skipped background refresh: silent token renewal failed ({detail or 'no token'}).")
+
+
+class TokenRefresher:
+    """
+    Keep the tokens of many clients fresh from one daemon thread.
+    Every `interval` seconds it calls credentials.authorization_header() for all registered clients
+    concurrently. Clients created with background_refresh=True use a token expiry leeway of
+    DEFAULT_REFRESH_MARGIN_SECONDS, so this poll (not a request on the hot path) is what finds the
+    token due and renews it from the token_cache_path cache.
+    Renewal here is silent only (cached access token or refresh token, see _renew_silently): when
+    the cache cannot renew the token, the client is skipped instead of starting a device-code or
+    browser flow on this thread. Errors and skips are kept in `last_errors`; the request path will
+    sign in again as usual.
+    """
+
+    def __init__(self, interval: float = DEFAULT_REFRESH_INTERVAL_SECONDS, max_workers: int = 8):
+        self.interval = interval
+        self.max_workers = max_workers
+        self.refresh_count = 0
+        self.last_errors: dict[str, Exception] = {}
+        self._clients: dict[str, CogniteClient] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name, client: CogniteClient, start: bool = True) -> None:
+        """Track a client under a name (e.g. the customer); starts the thread unless start=False."""
+        with self._lock:
+            self._clients[name] = client
+        if start:
+            self.start()
+
+    def unregister(self, name) -> None:
+        """Stop tracking a client; the thread stops once no clients are left."""
+        with self._lock:
+            self._clients.pop(name, None)
+            self.last_errors.pop(name, None)
+            if not self._clients:
+                self._stop.set()
+
+    def _refresh_one(self, item) -> tuple:
+        name, client = item
+        try:
+            credentials = client.config.credentials
+            _renew_silently(credentials)
+            credentials.authorization_header()
+            return name, None
+        except Exception as e:
+            return name, e
+
+    def refresh_now(self) -> dict:
+        """Check/renew every registered token concurrently. Returns {name: exception or None}."""
+        with self._lock:
+            items = list(self._clients.items())
+        if not items:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            results = dict(pool.map(self._refresh_one, items))
+        with self._lock:
+            self.refresh_count += 1
+            for name, error in results.items():
+                if error is None:
+                    self.last_errors.pop(name, None)
+                else:
+                    self.last_errors[name] = error
+        return results
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            self.refresh_now()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self) -> None:
+        """Start the daemon thread (no-op if already running)."""
+        with self._lock:
+            if self.running:
+                return
+            # A fresh event per thread: a thread still winding down after a stop keeps its own.
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop,), name="cognite-token-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the thread; registered clients keep working and refresh on demand again."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_DEFAULT_REFRESHER: TokenRefresher | None = None
+_DEFAULT_REFRESHER_LOCK = threading.Lock()
+
+
+def default_token_refresher() -> TokenRefresher:
+    """Shared TokenRefresher used by the client factories' background_refresh option."""
+    global _DEFAULT_REFRESHER
+    with _DEFAULT_REFRESHER_LOCK:
+        if _DEFAULT_REFRESHER is None:
+            _DEFAULT_REFRESHER = TokenRefresher()
+        return _DEFAULT_REFRESHER
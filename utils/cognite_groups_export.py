@@ -6,7 +6,8 @@ import re
 
 import pandas as pd
 
-from cognite_auth import CUSTOMER_CONFIGS, client_with_fallback
+from cognite_auth import client_with_fallback, default_token_refresher, resolve_customers
+from rate_limiter import limited_call
 
 
 def extract_resource_name(capability) -> str:
@@ -243,16 +244,14 @@ def export_groups(
     show_raw_capabilities: bool = False,
     max_groups_preview: int = 3,
     verbose: bool = True,
+    background_refresh: bool = False,
 ) -> tuple[dict[str, pd.DataFrame | None], Path]:
-    """Fetch groups for customers, build DataFrames, and export to Excel."""
-    if customers is None:
-        customer_list = list(CUSTOMER_CONFIGS.keys())
-    elif isinstance(customers, str):
-        customer_list = [customers]
-    else:
-        customer_list = list(customers)
-    if not customer_list:
-        raise ValueError("No customers specified.")
+    """
+    Fetch groups for customers, build DataFrames, and export to Excel.
+    background_refresh: keep each customer's token fresh from a background thread (see cognite_auth.TokenRefresher)
+    while its groups are fetched; the client is unregistered afterwards.
+    """
+    customer_list = resolve_customers(customers)
 
     token_cache_dir = token_cache_dir or (Path.home() / ".cognite" / "token_cache")
     output_path = Path(output_file)
@@ -265,7 +264,9 @@ def export_groups(
             print(f"Fetching groups for customer: {customer_name}")
         cache_path = token_cache_dir / f"{customer_name}.json" if token_cache_dir else None
         try:
-            customer_client = client_with_fallback(customer_name, cache_path, verbose=verbose)
+            customer_client = client_with_fallback(
+                customer_name, cache_path, verbose=verbose, background_refresh=background_refresh
+            )
         except Exception as exc:
             if verbose:
                 print(f"  ✗ Error fetching groups for {customer_name}: {exc}")
@@ -273,10 +274,14 @@ def export_groups(
             dataframes_by_customer[customer_name] = None
             continue
 
-        if show_profile and cache_path is not None:
-            print_user_profile(customer_client, cache_path)
+        try:
+            if show_profile and cache_path is not None:
+                print_user_profile(customer_client, cache_path)
 
-        groups = customer_client.iam.groups.list(all=True)
+            groups = limited_call(customer_client, customer_client.iam.groups.list, all=True)
+        finally:
+            if background_refresh:
+                default_token_refresher().unregister(customer_name)
         groups_by_customer[customer_name] = groups
         if verbose:
             print(f"  ✓ Found {len(groups)} groups for {customer_name}")
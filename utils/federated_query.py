@@ -0,0 +1,137 @@
+"""
+Run the same CDF query against several customers (projects from CUSTOMER_CONFIGS) concurrently
+and merge the results into one DataFrame with a "customer" column.
+At most one query runs per project at a time while different tenants run in parallel, so a
+cross-tenant inventory takes about as long as the slowest one. The query itself is not run inside a
+limiter slot (the limiter is not reentrant); the individual SDK calls go through the project limiter.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+
+from cognite_auth import client_with_fallback, resolve_customers
+from rate_limiter import limited_call
+
+DEFAULT_TOKEN_CACHE_DIR = Path.home() / ".cognite" / "token_cache"
+
+# Clients reused across federated calls in the same session: {customer: CogniteClient}.
+_CLIENTS: dict[str, Any] = {}
+
+
+def get_customer_client(customer: str, token_cache_dir: Path | None = None, background_refresh: bool = False):
+    """Cached client per customer (device-code first, then interactive, like export_groups)."""
+    client = _CLIENTS.get(customer)
+    if client is None:
+        cache_dir = token_cache_dir or DEFAULT_TOKEN_CACHE_DIR
+        client = client_with_fallback(customer, cache_dir / f"{customer}.json", background_refresh=background_refresh)
+        _CLIENTS[customer] = client
+    return client
+
+
+def _project(client, customer: str) -> str:
+    """Project the client talks to (falls back to the customer name)."""
+    return getattr(getattr(client, "config", None), "project", None) or customer
+
+
+def _to_dataframe(result) -> pd.DataFrame:
+    """Convert an SDK list / DataFrame / list of dicts / None to a DataFrame."""
+    if result is None:
+        return pd.DataFrame()
+    if isinstance(result, pd.DataFrame):
+        return result
+    if hasattr(result, "to_pandas"):
+        return result.to_pandas()
+    return pd.DataFrame(list(result))
+
+
+def federated_query(
+    query: Callable[[Any], Any],
+    customers: str | Iterable[str] | None = None,
+    max_workers: int = 8,
+    client_factory: Callable[[str], Any] | None = None,
+    raise_on_error: bool = False,
+) -> pd.DataFrame:
+    """
+    Call query(client) for every customer concurrently and concatenate the results.
+    query: e.g. `lambda c: limited_call(c, c.assets.list, limit=-1)`; may return an SDK list, DataFrame
+    or list of dicts. It may use limited helpers (get_asset_cache, TimeSeriesIdResolver, ...).
+    customers: None for all configured customers, a name, or an iterable of names.
+    client_factory: customer -> CogniteClient (default: get_customer_client).
+    raise_on_error: re-raise the first failure instead of skipping that customer.
+    Failed customers are listed in result.attrs["errors"] as {customer: exception}.
+    """
+    customer_list = resolve_customers(customers)
+    factory = client_factory or get_customer_client
+    # Build clients up front and one at a time: auth may prompt, and prompts must not interleave.
+    clients: dict[str, Any] = {}
+    errors: dict[str, Exception] = {}
+    for customer in customer_list:
+        try:
+            clients[customer] = factory(customer)
+        except Exception as e:
+            if raise_on_error:
+                raise
+            errors[customer] = e
+
+    # One in-flight query per project; customers sharing a project take turns.
+    project_locks: dict[str, threading.Lock] = {}
+    for customer, client in clients.items():
+        project_locks.setdefault(_project(client, customer), threading.Lock())
+
+    def run(customer: str):
+        client = clients[customer]
+        try:
+            with project_locks[_project(client, customer)]:
+                return customer, _to_dataframe(query(client)), None
+        except Exception as e:
+            return customer, None, e
+
+    frames = []
+    if clients:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(clients)))) as pool:
+            for customer, df, error in pool.map(run, list(clients)):
+                if error is not None:
+                    if raise_on_error:
+                        raise error
+                    errors[customer] = error
+                    continue
+                frames.append(df.assign(customer=customer) if len(df.columns) else pd.DataFrame({"customer": []}))
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"customer": []})
+    result = result[["customer"] + [c for c in result.columns if c != "customer"]]
+    result.attrs["errors"] = errors
+    return result
+
+
+def federated_list(
+    resource: str,
+    customers: str | Iterable[str] | None = None,
+    max_workers: int = 8,
+    client_factory: Callable[[str], Any] | None = None,
+    **list_kwargs,
+) -> pd.DataFrame:
+    """
+    `client.<resource>.list(**list_kwargs)` for every customer, e.g.
+    federated_list("time_series", data_set_external_ids=["populations"], limit=-1).
+    The list call is one limited call: on a 429 the whole listing (all pages) is retried.
+    """
+    return federated_query(
+        lambda c: limited_call(c, getattr(c, resource).list, **list_kwargs), customers, max_workers, client_factory
+    )
+
+
+def federated_search(
+    resource: str,
+    customers: str | Iterable[str] | None = None,
+    max_workers: int = 8,
+    client_factory: Callable[[str], Any] | None = None,
+    **search_kwargs,
+) -> pd.DataFrame:
+    """`client.<resource>.search(**search_kwargs)` for every customer, e.g. federated_search("assets", name="pump")."""
+    return federated_query(
+        lambda c: limited_call(c, getattr(c, resource).search, **search_kwargs), customers, max_workers, client_factory
+    )
@@ -9,6 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from types import SimpleNamespace
 
+from capability_compaction import compact_capability_dicts
 from cognite_groups_export import (
     build_customer_dataframe,
     collect_all_capabilities,
@@ -25,14 +26,30 @@ def _timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
 
+def group_backup_records(groups: list, compact: bool = False) -> list[dict]:
+    """
+    Convert Group objects to backup records: [{"id", "name", "capabilities": [dict, ...]}, ...].
+    compact: store capabilities merged by capability_compaction (same permissions, smaller JSON).
+    """
+    records = []
+    for g in groups:
+        capabilities = [c.dump(camel_case=True) for c in (getattr(g, "capabilities") or [])]
+        if compact:
+            capabilities = compact_capability_dicts(capabilities)
+        records.append({"id": g.id, "name": getattr(g, "name", ""), "capabilities": capabilities})
+    return records
+
+
 def backup_groups_to_archive(
     groups_by_customer: dict[str, list],
     archive_dir: Path | str | None = None,
+    compact: bool = False,
 ) -> tuple[Path, Path]:
     """
     Save current groups to the archive: one Excel (same format as groups_by_customer.xlsx) and one JSON (for restore).
     groups_by_customer: {customer_name: list of Group objects}
     archive_dir: where to write files (default: DEFAULT_ARCHIVE_DIR).
+    compact: write compacted capabilities to the JSON (the Excel always shows the live entries).
     Returns (excel_path, json_path).
     """
     archive_path = Path(archive_dir) if archive_dir else DEFAULT_ARCHIVE_DIR
@@ -50,14 +67,7 @@ def backup_groups_to_archive(
             backup_data[customer_name] = []
             continue
         dataframes_by_customer[customer_name] = build_customer_dataframe(groups, all_capabilities)
-        backup_data[customer_name] = [
-            {
-                "id": g.id,
-                "name": getattr(g, "name", ""),
-                "capabilities": [c.dump(camel_case=True) for c in (getattr(g, "capabilities") or [])],
-            }
-            for g in groups
-        ]
+        backup_data[customer_name] = group_backup_records(groups, compact=compact)
     write_groups_to_excel(dataframes_by_customer, excel_path)
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(backup_data, f, indent=2)
@@ -0,0 +1,131 @@
+"""
+Diff two group backups (as written by backup_groups_to_archive), or a backup against live groups.
+Each group's capability list is normalized (sorted actions, sorted scope ids, duplicates dropped)
+and hashed in compacted form (see capability_compaction), so compacted and uncompacted backups of
+the same permissions compare equal; groups with equal hashes are skipped, so only changed groups
+pay for key extraction, which uses the original (uncompacted) capabilities.
+The report has one row per added / removed / changed / renamed group with the capability keys
+(same format as groups_by_customer.xlsx columns) that were added or removed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+from capability_compaction import compact_capability_dicts
+from cognite_groups_export import get_group_capability_keys
+from group_backup_restore import group_backup_records, load_backup_json
+
+REPORT_COLUMNS = ["customer", "group_id", "group_name", "change", "added_keys", "removed_keys"]
+
+
+def _normalize(value):
+    """Recursively sort lists of scalars (actions, scope ids) so equal permissions compare equal."""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, list):
+        items = [_normalize(v) for v in value]
+        if all(not isinstance(v, (dict, list)) for v in items):
+            return sorted(set(items), key=lambda v: (str(type(v)), v))
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+
+def normalize_capabilities(capabilities: list[dict]) -> list[dict]:
+    """Normalized, de-duplicated, sorted copy of a group's capability dicts."""
+    unique = {json.dumps(_normalize(c), sort_keys=True): c for c in capabilities}
+    return [_normalize(unique[k]) for k in sorted(unique)]
+
+
+def capability_set_hash(capabilities: list[dict]) -> str:
+    """SHA-256 of the compacted, normalized capability set; equal hashes mean equal permissions."""
+    canonical = normalize_capabilities(compact_capability_dicts(capabilities))
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def capability_keys_from_dicts(capabilities: list[dict]) -> set[str]:
+    """Capability keys (resource:action[:scope]) for capability dicts from a backup."""
+    from cognite.client.data_classes.capabilities import Capability
+
+    caps = [Capability.load(c, allow_unknown=True) for c in normalize_capabilities(capabilities)]
+    return get_group_capability_keys(SimpleNamespace(capabilities=caps))
+
+
+def _index_groups(groups_data: list[dict]) -> dict:
+    return {g["id"]: g for g in groups_data}
+
+
+def diff_backups(old: dict, new: dict) -> pd.DataFrame:
+    """
+    Compare two backups ({customer: [{"id", "name", "capabilities"}, ...]}) by group id.
+    Returns a DataFrame with REPORT_COLUMNS; unchanged groups are not listed.
+    """
+    rows = []
+    for customer in sorted(set(old) | set(new)):
+        before = _index_groups(old.get(customer) or [])
+        after = _index_groups(new.get(customer) or [])
+        for gid in sorted(set(before) | set(after), key=str):
+            b, a = before.get(gid), after.get(gid)
+            if b is None:
+                change, added, removed = "added", capability_keys_from_dicts(a["capabilities"]), set()
+            elif a is None:
+                change, added, removed = "removed", set(), capability_keys_from_dicts(b["capabilities"])
+            elif capability_set_hash(b["capabilities"]) == capability_set_hash(a["capabilities"]):
+                if b.get("name") == a.get("name"):
+                    continue
+                change, added, removed = "renamed", set(), set()
+            else:
+                old_keys = capability_keys_from_dicts(b["capabilities"])
+                new_keys = capability_keys_from_dicts(a["capabilities"])
+                change, added, removed = "changed", new_keys - old_keys, old_keys - new_keys
+            rows.append(
+                {
+                    "customer": customer,
+                    "group_id": gid,
+                    "group_name": (a or b).get("name", ""),
+                    "change": change,
+                    "added_keys": sorted(added),
+                    "removed_keys": sorted(removed),
+                }
+            )
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def diff_backup_files(old_json_path: Path | str, new_json_path: Path | str) -> pd.DataFrame:
+    """Diff two backup JSON files (e.g. two entries from list_backups)."""
+    return diff_backups(load_backup_json(old_json_path), load_backup_json(new_json_path))
+
+
+def diff_backup_against_live(backup_data: dict, groups_by_customer: dict[str, list]) -> pd.DataFrame:
+    """
+    Diff a loaded backup against live groups ({customer: list of Group objects}, as fetched for
+    backup_groups_to_archive). Customers whose live groups are None (fetch failed) are skipped.
+    """
+    live = {name: group_backup_records(groups) for name, groups in groups_by_customer.items() if groups is not None}
+    old = {name: data for name, data in backup_data.items() if name in live}
+    return diff_backups(old, live)
+
+
+def write_diff_report(report: pd.DataFrame, output_path: Path | str) -> Path:
+    """Write the report as .xlsx, .json or .csv (chosen by suffix); key lists are joined with newlines for Excel/CSV."""
+    output = Path(output_path)
+    suffix = output.suffix.lower()
+    if suffix == ".json":
+        output.write_text(report.to_json(orient="records", indent=2), encoding="utf-8")
+        return output
+    flat = report.assign(
+        added_keys=report["added_keys"].map("\n".join),
+        removed_keys=report["removed_keys"].map("\n".join),
+    )
+    if suffix == ".xlsx":
+        flat.to_excel(output, index=False, engine="openpyxl")
+    elif suffix == ".csv":
+        flat.to_csv(output, index=False)
+    else:
+        raise ValueError(f"Unsupported report format {suffix!r}; use .xlsx, .json or .csv.")
+    return output
@@ -0,0 +1,147 @@
+"""
+Batched latest-datapoint lookup with a short-TTL in-process cache.
+Instead of one `time_series.data.retrieve_latest(...)` per time series, LatestValueCache.get()
+resolves many ids / external ids (or names, through TimeSeriesIdResolver) at once: cache misses
+are split into batches fetched concurrently through the project limiter, and results are reused
+until they are `ttl` seconds old, so a dashboard refresh costs one round of calls at most.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Sequence
+
+import pandas as pd
+
+from rate_limiter import limited_call
+
+# Time series per retrieve_latest request.
+DEFAULT_BATCH_SIZE = 100
+
+RESULT_COLUMNS = ["id", "external_id", "timestamp", "value"]
+
+
+class LatestValueCache:
+    """
+    client: CogniteClient
+    ttl: seconds a fetched latest value is served from memory.
+    resolver: optional TimeSeriesIdResolver, needed for get(names=...).
+    Unknown ids and series without datapoints come back with NaT/NaN (and are cached as such).
+    """
+
+    def __init__(
+        self,
+        client,
+        ttl: float = 30.0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = 4,
+        resolver=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.resolver = resolver
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # {("id", 123) | ("external_id", "x"): (fetched_at, id, external_id, timestamp_ms, value)}
+        self._cache: dict[tuple[str, object], tuple] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, ids: Iterable[int] = (), external_ids: Iterable[str] = ()) -> None:
+        """Drop specific entries (e.g. right after inserting datapoints), or everything if none given."""
+        keys = [("id", i) for i in ids] + [("external_id", x) for x in external_ids]
+        with self._lock:
+            if not keys:
+                self._cache.clear()
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def _fresh(self, keys: list[tuple[str, object]]) -> tuple[dict, list]:
+        now = self.clock()
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                entry = self._cache.get(key)
+                if entry is not None and now - entry[0] < self.ttl:
+                    found[key] = entry
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def _fetch_batch(self, kind: str, batch: Sequence) -> dict:
+        dps_list = limited_call(
+            self.client,
+            self.client.time_series.data.retrieve_latest,
+            **{kind: list(batch)},
+            ignore_unknown_ids=True,
+        )
+        fetched_at = self.clock()
+        entries = {(kind, key): (fetched_at, None, None, None, None) for key in batch}
+        for dps in dps_list or []:
+            key = dps.id if kind == "id" else dps.external_id
+            timestamp = dps.timestamp[-1] if len(dps.timestamp) else None
+            value = dps.value[-1] if len(dps.timestamp) else None
+            entries[(kind, key)] = (fetched_at, dps.id, dps.external_id, timestamp, value)
+        return entries
+
+    def _fetch(self, missing: list[tuple[str, object]]) -> dict:
+        batches = []
+        for kind in ("id", "external_id"):
+            keys = [k for t, k in missing if t == kind]
+            batches += [(kind, keys[i : i + self.batch_size]) for i in range(0, len(keys), self.batch_size)]
+        if not batches:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as pool:
+            results = list(pool.map(lambda b: self._fetch_batch(*b), batches))
+        entries = {k: v for result in results for k, v in result.items()}
+        with self._lock:
+            self._cache.update(entries)
+        return entries
+
+    def get(
+        self,
+        ids: Iterable[int] = (),
+        external_ids: Iterable[str] = (),
+        names: Iterable[str] = (),
+    ) -> pd.DataFrame:
+        """
+        Latest datapoint for each requested time series, one row per request in the order given,
+        with RESULT_COLUMNS ("timestamp" as UTC datetime) and a "key" index (the id / external id / name).
+        """
+        names = list(names)
+        name_to_id = {}
+        if names:
+            if self.resolver is None:
+                raise ValueError("Looking up names needs a TimeSeriesIdResolver (resolver=...).")
+            name_to_id = self.resolver.resolve_names(names)
+        requested = (
+            [(i, ("id", i)) for i in ids]
+            + [(x, ("external_id", x)) for x in external_ids]
+            + [(n, ("id", name_to_id[n]) if n in name_to_id else None) for n in names]
+        )
+        keys = list(dict.fromkeys(k for _, k in requested if k is not None))
+        found, missing = self._fresh(keys)
+        if missing:
+            found.update(self._fetch(missing))
+
+        rows = []
+        for label, key in requested:
+            entry = found.get(key) if key is not None else None
+            _, ts_id, xid, timestamp, value = entry or (None, None, None, None, None)
+            if ts_id is None and key is not None:
+                ts_id, xid = (key[1], None) if key[0] == "id" else (None, key[1])
+            rows.append({"key": label, "id": ts_id, "external_id": xid, "timestamp": timestamp, "value": value})
+        df = pd.DataFrame(rows, columns=["key"] + RESULT_COLUMNS).set_index("key")
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+        return df
+
+    def get_values(self, ids: Iterable[int] = (), external_ids: Iterable[str] = (), names: Iterable[str] = ()) -> dict:
+        """{key: latest value or None} for quick lookups (see get() for timestamps)."""
+        df = self.get(ids, external_ids, names)
+        return {k: (None if pd.isna(v) else v) for k, v in df["value"].items()}
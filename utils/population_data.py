@@ -0,0 +1,135 @@
+"""
+Reshape the World Bank population export (data/populations.csv) into the date-indexed,
+country-filtered layout the training notebooks ingest (data/populations_postprocessed.csv),
+plus derived series (year-over-year growth, rolling averages).
+Results are cached on disk keyed by the SHA-256 of the input files, so re-running a notebook
+does not repeat the work unless the CSVs change.
+"""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = _PROJECT_ROOT / "data"
+DEFAULT_POPULATIONS_PATH = DATA_DIR / "populations.csv"
+DEFAULT_COUNTRIES_PATH = DATA_DIR / "all_countries.csv"
+DEFAULT_CACHE_DIR = _PROJECT_ROOT / ".cache" / "population_data"
+
+# Identity columns in populations.csv; every other column is a year.
+_ID_COLUMNS = ["Country Name", "Country Code"]
+# Bump when the shape of cached frames changes so stale pickles are ignored.
+_CACHE_VERSION = 1
+
+
+def file_sha256(path: Path | str) -> str:
+    """Return the hex SHA-256 of a file's contents (read in 1 MiB blocks)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_country_names(countries_path: Path | str = DEFAULT_COUNTRIES_PATH) -> list[str]:
+    """Return the country names from all_countries.csv (the `name` column)."""
+    return pd.read_csv(countries_path, usecols=["name"])["name"].dropna().tolist()
+
+
+def reshape_populations(
+    wide: pd.DataFrame,
+    countries: list[str] | None = None,
+    start_year: int | None = None,
+    end_year: int | None = None,
+) -> pd.DataFrame:
+    """
+    Transpose the wide export (one row per country, one column per year) into a frame indexed by
+    year-start dates with one float column per country.
+    countries: keep only these names (in the export's row order); regional aggregates such as
+    "Africa Eastern and Southern" are dropped this way. None keeps every row.
+    start_year / end_year: inclusive year bounds.
+    """
+    year_columns = [c for c in wide.columns if c not in _ID_COLUMNS]
+    values = wide.set_index("Country Name")[year_columns]
+    if countries is not None:
+        values = values[values.index.isin(countries)]
+    frame = values.T.astype(float)
+    frame.index = pd.to_datetime(frame.index, format="%Y")
+    frame.index.name = None
+    frame.columns.name = None
+    if start_year is not None:
+        frame = frame[frame.index.year >= start_year]
+    if end_year is not None:
+        frame = frame[frame.index.year <= end_year]
+    return frame
+
+
+def yoy_growth(populations: pd.DataFrame) -> pd.DataFrame:
+    """Year-over-year growth as a fraction (0.01 == 1%). Gaps stay NaN instead of being forward-filled."""
+    return populations.pct_change(fill_method=None)
+
+
+def rolling_average(populations: pd.DataFrame, window: int = 5, min_periods: int | None = None) -> pd.DataFrame:
+    """Trailing rolling mean over `window` rows (years)."""
+    return populations.rolling(window, min_periods=window if min_periods is None else min_periods).mean()
+
+
+def _cache_key(*parts: object) -> str:
+    """Stable short key from input file hashes and parameters."""
+    return hashlib.sha256("|".join(str(p) for p in (_CACHE_VERSION, *parts)).encode("utf-8")).hexdigest()[:16]
+
+
+def build_population_frames(
+    populations_path: Path | str = DEFAULT_POPULATIONS_PATH,
+    countries_path: Path | str = DEFAULT_COUNTRIES_PATH,
+    start_year: int | None = 1990,
+    end_year: int | None = None,
+    rolling_window: int = 5,
+    cache_dir: Path | str | None = DEFAULT_CACHE_DIR,
+) -> dict[str, pd.DataFrame]:
+    """
+    Build {"population", "growth", "rolling_mean"} frames, all indexed by year-start dates with one
+    column per country. With the defaults, "population" matches data/populations_postprocessed.csv.
+    cache_dir: where cached frames live (None disables caching). The cache key covers both input
+    files' hashes and every parameter, so editing a CSV or changing a window recomputes.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        key = _cache_key(
+            file_sha256(populations_path),
+            file_sha256(countries_path),
+            start_year,
+            end_year,
+            rolling_window,
+        )
+        cache_path = Path(cache_dir) / f"population_frames_{key}.pkl"
+        if cache_path.exists():
+            return pd.read_pickle(cache_path)
+
+    wide = pd.read_csv(populations_path)
+    # Growth and rolling windows need the years before start_year, so trim only at the end.
+    full = reshape_populations(wide, load_country_names(countries_path), end_year=end_year)
+    frames = {
+        "population": full,
+        "growth": yoy_growth(full),
+        "rolling_mean": rolling_average(full, rolling_window),
+    }
+    if start_year is not None:
+        frames = {name: df[df.index.year >= start_year] for name, df in frames.items()}
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(frames, cache_path)
+    return frames
+
+
+def write_postprocessed_populations(
+    output_path: Path | str = DATA_DIR / "populations_postprocessed.csv",
+    **kwargs,
+) -> Path:
+    """Regenerate populations_postprocessed.csv from the raw export. kwargs go to build_population_frames."""
+    output = Path(output_path)
+    build_population_frames(**kwargs)["population"].to_csv(output)
+    return output
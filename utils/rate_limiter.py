@@ -0,0 +1,184 @@
+"""
+Shared adaptive concurrency limiter for CDF calls, one per cognite_project.
+Every helper in utils that talks to CDF goes through limited_call(client, fn, ...), so parallel
+exports, restores, uploads and ingestion for the same project share one budget.
+The limit follows AIMD: +1 slot per `limit` successful calls, halved on 429/503 (which are retried
+with exponential backoff). The SDK also retries 429s internally; this limiter sees the ones that
+survive those retries and slows everyone down instead of just the caller.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# HTTP status codes treated as "slow down" rather than as failures.
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """True if exc is a CogniteAPIError (or anything with .code) signalling 429/503."""
+    return getattr(exc, "code", None) in THROTTLE_STATUS_CODES
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for a single CDF project.
+    Use `with limiter.slot(): ...` around a call and report the outcome with on_success/on_throttle,
+    or let call() do all of that plus retry-with-backoff on throttling.
+    """
+
+    def __init__(
+        self,
+        project: str,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit.")
+        self.project = project
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._calls = 0
+        self._successes = 0
+        self._throttles = 0
+        self._failures = 0
+        self._queue_time = 0.0
+        self._max_queue_time = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent calls allowed."""
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Block until a concurrency slot is free, hold it for the duration of the with-block."""
+        start = time.monotonic()
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            waited = time.monotonic() - start
+            self._calls += 1
+            self._queue_time += waited
+            self._max_queue_time = max(self._max_queue_time, waited)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        """Additive increase: roughly one extra slot per `limit` successes."""
+        with self._cond:
+            self._successes += 1
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease after a 429/503."""
+        with self._cond:
+            self._throttles += 1
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+
+    def on_failure(self) -> None:
+        """Record a non-throttle error (does not change the limit)."""
+        with self._cond:
+            self._failures += 1
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run fn(*args, **kwargs) inside a slot. Throttled calls release their slot, back off and retry
+        up to max_retries times; the last throttle error (or any other error) is re-raised.
+        """
+        attempt = 0
+        while True:
+            with self.slot():
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as exc:
+                    if not is_throttle_error(exc):
+                        self.on_failure()
+                        raise
+                    self.on_throttle()
+                    if attempt >= self.max_retries:
+                        raise
+                else:
+                    self.on_success()
+                    return result
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stats(self) -> dict:
+        """Snapshot of counters: calls, successes, throttles, failures, queue time and current limit."""
+        with self._cond:
+            return {
+                "project": self.project,
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "calls": self._calls,
+                "successes": self._successes,
+                "throttles": self._throttles,
+                "failures": self._failures,
+                "total_queue_time_s": self._queue_time,
+                "avg_queue_time_s": self._queue_time / self._calls if self._calls else 0.0,
+                "max_queue_time_s": self._max_queue_time,
+            }
+
+
+_LIMITERS: dict[str, AdaptiveLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(project: str, **kwargs) -> AdaptiveLimiter:
+    """Return the shared limiter for a cognite_project, creating it (with kwargs) on first use."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(project)
+        if limiter is None:
+            limiter = _LIMITERS[project] = AdaptiveLimiter(project, **kwargs)
+        return limiter
+
+
+def limiter_for(client) -> AdaptiveLimiter:
+    """Shared limiter for the project a CogniteClient is configured for."""
+    return get_limiter(str(client.config.project))
+
+
+def limited_call(client, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run fn(*args, **kwargs) through the shared limiter of client's project."""
+    return limiter_for(client).call(fn, *args, **kwargs)
+
+
+def limiter_stats() -> dict[str, dict]:
+    """Stats for every project that has made calls through a limiter: {project: stats}."""
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    return {limiter.project: limiter.stats() for limiter in limiters}
+
+
+def reset_limiters() -> None:
+    """Drop all shared limiters (e.g. between notebook runs or in tests)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
@@ -4,6 +4,12 @@ Used by the Remove_Capabilities.ipynb playbook.
 """
 from __future__ import annotations
 
+from capability_compaction import compact_capabilities
+from rate_limiter import limited_call
+
+# Max groups per /groups/update request when updating in batches.
+UPDATE_BATCH_SIZE = 25
+
 # Legacy entity resource names: capabilities for these resources can be removed in bulk.
 LEGACY_RESOURCE_NAMES = [
     "assets",
@@ -78,24 +84,56 @@ def filter_capabilities_for_removal(group, to_remove: set[str], legacy_resources
     return keep
 
 
-def update_group_capabilities(client, group, new_capabilities: list) -> dict:
+def _capabilities_update_item(group_id: int, new_capabilities: list) -> dict:
+    """One /groups/update item that replaces a group's capabilities."""
+    return {
+        "id": group_id,
+        "update": {
+            "capabilities": {
+                "set": [c.dump(camel_case=True) for c in new_capabilities],
+            }
+        },
+    }
+
+
+def _post_group_updates(client, items: list[dict]) -> dict:
+    res = limited_call(
+        client,
+        client.iam.groups._post,
+        url_path=client.iam.groups._RESOURCE_PATH + "/update",
+        json={"items": items},
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+def update_group_capabilities(client, group, new_capabilities: list, compact: bool = False) -> dict:
     """
     Call CDF API to update a group's capabilities.
     client: CogniteClient
     group: Group with .id
     new_capabilities: list of Capability objects (will be dumped to API format).
-    Returns the API response (or raises).
+    compact: merge redundant entries first (see capability_compaction).
+    Returns the API response (or raises). Goes through the project's shared rate limiter.
     """
-    payload = [
-        {
-            "id": group.id,
-            "update": {
-                "capabilities": {
-                    "set": [c.dump(camel_case=True) for c in new_capabilities],
-                }
-            },
-        }
-    ]
-    res = client.iam.groups._post(url_path=client.iam.groups._RESOURCE_PATH + "/update", json={"items": payload})
-    res.raise_for_status()
-    return res.json()
+    if compact:
+        new_capabilities = compact_capabilities(new_capabilities)
+    return _post_group_updates(client, [_capabilities_update_item(group.id, new_capabilities)])
+
+
+def update_groups_capabilities(
+    client,
+    updates: dict[int, list],
+    batch_size: int = UPDATE_BATCH_SIZE,
+    compact: bool = False,
+) -> list[dict]:
+    """
+    Replace the capabilities of many groups with as few /groups/update calls as possible.
+    updates: {group_id: list of Capability objects}
+    compact: merge redundant entries per group first (see capability_compaction).
+    Returns the API responses, one per batch (raises on the first failing batch).
+    """
+    if compact:
+        updates = {gid: compact_capabilities(caps) for gid, caps in updates.items()}
+    items = [_capabilities_update_item(gid, caps) for gid, caps in updates.items()]
+    return [_post_group_updates(client, items[i : i + batch_size]) for i in range(0, len(items), batch_size)]
@@ -0,0 +1,150 @@
+"""
+Chunked, concurrent streaming of sequence rows in and out of CDF.
+`sequences.data.retrieve_dataframe(start=0, end=None)` and `sequences.data.insert(rows=...)` hold
+every row in memory at once; these helpers work in row-number ranges instead, keeping at most
+`max_workers` chunks in flight so memory stays bounded however long the sequence is.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import pandas as pd
+
+from rate_limiter import limited_call
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _identifier(id: int | None, external_id: str | None) -> dict:
+    """Exactly one of id / external_id, as keyword arguments for the SDK."""
+    if (id is None) == (external_id is None):
+        raise ValueError("Pass exactly one of id or external_id.")
+    return {"id": id} if id is not None else {"external_id": external_id}
+
+
+def row_ranges(start: int, end: int, chunk_size: int) -> list[tuple[int, int]]:
+    """Split [start, end) into consecutive [a, b) ranges of at most chunk_size rows."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    return [(a, min(a + chunk_size, end)) for a in range(start, end, chunk_size)]
+
+
+def sequence_row_end(client, id: int | None = None, external_id: str | None = None) -> int:
+    """Exclusive end row number (last row number + 1); 0 for an empty sequence."""
+    last = limited_call(client, client.sequences.data.retrieve_last_row, **_identifier(id, external_id))
+    rows = getattr(last, "rows", None) or []
+    return max(r.row_number for r in rows) + 1 if rows else 0
+
+
+def iter_sequence_dataframes(
+    client,
+    id: int | None = None,
+    external_id: str | None = None,
+    start: int = 0,
+    end: int | None = None,
+    column_external_ids: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = 4,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the sequence's rows in [start, end) as DataFrames of up to chunk_size rows, in row order.
+    Ranges are fetched concurrently (at most max_workers at once, through the project limiter);
+    empty ranges (gaps in the row numbers) are skipped.
+    end: None reads up to the last row.
+    """
+    ident = _identifier(id, external_id)
+    if end is None:
+        end = sequence_row_end(client, **ident)
+    ranges = deque(row_ranges(start, end, chunk_size))
+
+    def fetch(bounds: tuple[int, int]) -> pd.DataFrame:
+        a, b = bounds
+        return limited_call(
+            client,
+            client.sequences.data.retrieve_dataframe,
+            start=a,
+            end=b,
+            column_external_ids=column_external_ids,
+            **ident,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: deque[Future] = deque()
+        while ranges or pending:
+            while ranges and len(pending) < max_workers:
+                pending.append(pool.submit(fetch, ranges.popleft()))
+            df = pending.popleft().result()
+            if len(df):
+                yield df
+
+
+def sequence_to_parquet(client, output_path: Path | str, **kwargs) -> int:
+    """
+    Stream a sequence into a Parquet file chunk by chunk (requires pyarrow).
+    kwargs go to iter_sequence_dataframes. Returns the number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("sequence_to_parquet requires pyarrow: pip install pyarrow") from exc
+
+    output = Path(output_path)
+    writer = None
+    rows = 0
+    try:
+        for df in iter_sequence_dataframes(client, **kwargs):
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def insert_sequence_rows(
+    client,
+    rows: Iterable[Any],
+    columns: Sequence[str],
+    id: int | None = None,
+    external_id: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = 4,
+) -> int:
+    """
+    Insert rows from any iterable (e.g. a generator) in chunks of chunk_size.
+    rows: items in any format `sequences.data.insert` accepts as a list, e.g. (row_number, [values]).
+    Only max_workers chunks are held in memory at once: reading the iterable pauses while
+    that many inserts are in flight. Returns the number of rows inserted.
+    """
+    ident = _identifier(id, external_id)
+    columns = list(columns)
+    iterator = iter(rows)
+    inserted = 0
+
+    def insert(chunk: list) -> int:
+        limited_call(client, client.sequences.data.insert, rows=chunk, columns=columns, **ident)
+        return len(chunk)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: deque[Future] = deque()
+        while True:
+            # Wait for a slot before reading the next chunk, so at most max_workers are held.
+            if len(pending) >= max_workers:
+                inserted += pending.popleft().result()
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            pending.append(pool.submit(insert, chunk))
+        while pending:
+            inserted += pending.popleft().result()
+    return inserted
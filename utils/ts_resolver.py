@@ -0,0 +1,238 @@
+"""
+Cached, batched resolution of time series names / external ids to internal ids.
+Replaces `client.time_series.list(data_set_ids=[...], limit=-1).to_pandas()[['name','id']]` style
+lookups: only unknown keys hit CDF, in batches (retrieve_multiple for external ids, an `in` filter
+for names), and results live in an LRU plus an optional JSON file on disk.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import pandas as pd
+from cognite.client.data_classes import filters
+from cognite.client.data_classes.time_series import TimeSeriesProperty
+
+from rate_limiter import limited_call
+
+# External ids per retrieve_multiple request (the byids endpoint limit).
+DEFAULT_BATCH_SIZE = 1000
+# Names per `in` filter in a time series list request; kept small, as the filter's value limit is
+# lower than the byids one.
+DEFAULT_NAME_BATCH_SIZE = 100
+
+_KINDS = ("external_id", "name")
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+class TimeSeriesIdResolver:
+    """
+    Map time series external ids or names to internal ids for one project.
+    client: CogniteClient
+    data_set_ids: restrict name lookups to these data sets (names are not unique across a project).
+    maxsize: LRU capacity per kind (external_id / name).
+    cache_path: optional JSON file loaded on creation and written by save(). Cached names are only
+    loaded when the file was written with the same data_set_ids (external ids are project-wide).
+    batch_size / name_batch_size: identifiers per request for external ids / names.
+    Names that match several time series are left unresolved and listed in `ambiguous_names` (and
+    dropped from it once they resolve to exactly one series).
+    negative_ttl: seconds unknown / ambiguous keys are remembered (in memory only) before CDF is asked
+    again; 0 disables this.
+    """
+
+    def __init__(
+        self,
+        client,
+        data_set_ids: Sequence[int] | None = None,
+        maxsize: int = 100_000,
+        cache_path: Path | str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = 4,
+        name_batch_size: int = DEFAULT_NAME_BATCH_SIZE,
+        negative_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.data_set_ids = list(data_set_ids) if data_set_ids else None
+        self.maxsize = maxsize
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.batch_size = batch_size
+        self.name_batch_size = name_batch_size
+        self.max_workers = max_workers
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.ambiguous_names: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self._lru: dict[str, OrderedDict[str, int]] = {kind: OrderedDict() for kind in _KINDS}
+        # {kind: {key: expires_at}} for keys that were unknown or ambiguous.
+        self._negative: dict[str, OrderedDict[str, float]] = {kind: OrderedDict() for kind in _KINDS}
+        self._lock = threading.Lock()
+        if self.cache_path and self.cache_path.exists():
+            self._load(self.cache_path)
+
+    def _load(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("project") != str(self.client.config.project):
+            return
+        # Name lookups are filtered by data set, so names resolved under other data sets do not apply.
+        same_data_sets = "data_set_ids" in data and (
+            sorted(data["data_set_ids"] or []) == sorted(self.data_set_ids or [])
+        )
+        for kind in _KINDS if same_data_sets else ("external_id",):
+            for key, ts_id in data.get(kind, {}).items():
+                self._put(kind, key, ts_id)
+
+    def save(self, path: Path | str | None = None) -> Path:
+        """Write the cached mappings to JSON (default: cache_path). Returns the path written."""
+        target = Path(path) if path else self.cache_path
+        if target is None:
+            raise ValueError("No cache_path configured; pass a path to save().")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "project": str(self.client.config.project),
+                "data_set_ids": self.data_set_ids,
+                **{k: dict(v) for k, v in self._lru.items()},
+            }
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return target
+
+    def clear(self) -> None:
+        """Forget every cached mapping (the on-disk file is left alone)."""
+        with self._lock:
+            for lru in self._lru.values():
+                lru.clear()
+            for negative in self._negative.values():
+                negative.clear()
+            self.ambiguous_names.clear()
+
+    def _put(self, kind: str, key: str, ts_id: int) -> None:
+        lru = self._lru[kind]
+        lru[key] = ts_id
+        lru.move_to_end(key)
+        while len(lru) > self.maxsize:
+            lru.popitem(last=False)
+
+    def _put_negative(self, kind: str, key: str) -> None:
+        if self.negative_ttl <= 0:
+            return
+        negative = self._negative[kind]
+        negative[key] = self.clock() + self.negative_ttl
+        negative.move_to_end(key)
+        while len(negative) > self.maxsize:
+            negative.popitem(last=False)
+
+    def _lookup(self, kind: str, keys: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+        """Split keys into cached {key: id} and a de-duplicated list of misses (known-negative keys are neither)."""
+        found: dict[str, int] = {}
+        missing: list[str] = []
+        now = self.clock()
+        with self._lock:
+            lru, negative = self._lru[kind], self._negative[kind]
+            for key in dict.fromkeys(keys):
+                if key in lru:
+                    lru.move_to_end(key)
+                    found[key] = lru[key]
+                elif key in negative and negative[key] > now:
+                    self.hits += 1
+                else:
+                    negative.pop(key, None)
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def _fetch_external_ids(self, batch: Sequence[str]) -> list:
+        return limited_call(
+            self.client,
+            self.client.time_series.retrieve_multiple,
+            external_ids=list(batch),
+            ignore_unknown_ids=True,
+        )
+
+    def _fetch_names(self, batch: Sequence[str]) -> list:
+        return limited_call(
+            self.client,
+            self.client.time_series.list,
+            data_set_ids=self.data_set_ids,
+            advanced_filter=filters.In(TimeSeriesProperty.name, list(batch)),
+            limit=-1,
+        )
+
+    def _fetch(self, kind: str, missing: list[str]) -> list:
+        fetch = self._fetch_external_ids if kind == "external_id" else self._fetch_names
+        batches = list(_chunks(missing, self.batch_size if kind == "external_id" else self.name_batch_size))
+        if len(batches) <= 1:
+            return [ts for batch in batches for ts in fetch(batch)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return [ts for result in pool.map(fetch, batches) for ts in result]
+
+    def _resolve(self, kind: str, keys: Iterable[str]) -> dict[str, int]:
+        found, missing = self._lookup(kind, keys)
+        if not missing:
+            return found
+        fetched = self._fetch(kind, missing)
+        ids_by_key: dict[str, set[int]] = {}
+        for ts in fetched:
+            key = ts.external_id if kind == "external_id" else ts.name
+            if key is not None:
+                ids_by_key.setdefault(key, set()).add(ts.id)
+        with self._lock:
+            for key, ids in ids_by_key.items():
+                if len(ids) > 1:
+                    self.ambiguous_names.add(key)  # only names can match several series
+                    self._put_negative(kind, key)
+                    continue
+                ts_id = next(iter(ids))
+                self._put(kind, key, ts_id)
+                if kind == "name":
+                    self.ambiguous_names.discard(key)
+                found[key] = ts_id
+            for key in missing:
+                if key not in ids_by_key:
+                    if kind == "name":
+                        self.ambiguous_names.discard(key)
+                    self._put_negative(kind, key)
+        return found
+
+    def resolve_external_ids(self, external_ids: Iterable[str]) -> dict[str, int]:
+        """{external_id: id} for every external id that exists; unknown ones are omitted."""
+        return self._resolve("external_id", external_ids)
+
+    def resolve_names(self, names: Iterable[str]) -> dict[str, int]:
+        """{name: id} for every name matching exactly one time series; others are omitted."""
+        return self._resolve("name", names)
+
+    def resolve_external_id(self, external_id: str) -> int:
+        """Single external id to id (KeyError if unknown)."""
+        return self.resolve_external_ids([external_id])[external_id]
+
+    def resolve_name(self, name: str) -> int:
+        """Single name to id (KeyError if unknown or ambiguous)."""
+        return self.resolve_names([name])[name]
+
+    def rename_columns_to_ids(self, df: pd.DataFrame, by: str = "name", strict: bool = True) -> pd.DataFrame:
+        """
+        Return df with time series names (by="name") or external ids (by="external_id") as columns
+        replaced by internal ids, ready for `time_series.data.insert_dataframe(df, external_id_headers=False)`.
+        strict: raise KeyError listing unresolved columns instead of leaving them unchanged.
+        """
+        if by not in _KINDS:
+            raise ValueError(f"by must be one of {_KINDS}, got {by!r}")
+        mapping = self._resolve(by, [str(c) for c in df.columns])
+        unresolved = [c for c in df.columns if str(c) not in mapping]
+        if strict and unresolved:
+            raise KeyError(f"Could not resolve time series for columns: {unresolved}")
+        return df.rename(columns=lambda c: mapping.get(str(c), c))
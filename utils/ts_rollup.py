@@ -0,0 +1,256 @@
+"""
+Hierarchical roll-up of asset-linked time series: e.g. country population series summed into
+sub-region, region and world series, following the asset hierarchy built from all_countries.csv.
+Children are aligned on the union of their timestamps with NumPy and combined (sum or mean) bottom
+up, so a parent's series is computed from its direct children (their own series, or their roll-up).
+Runs are incremental: only datapoints newer than the last seen ones are fetched, only ancestors of
+assets that got new datapoints are recomputed, and only timestamps from the earliest new one
+onward are written back to the synthetic series, in batched insert_multiple calls.
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+from cognite.client.data_classes import DatapointsQuery, TimeSeries
+
+from asset_cache import AssetHierarchyCache
+from rate_limiter import limited_call
+
+# CDF accepts datapoints from 1900-01-01; population data starts in 1960 (negative epoch ms).
+MIN_TIMESTAMP_MS = -2208988800000
+
+DEFAULT_EXTERNAL_ID_PREFIX = "rollup:"
+# Metadata key set on every series created by a roll-up (value: the aggregation).
+ROLLUP_METADATA_KEY = "rollup"
+
+# Time series per insert_multiple / retrieve call.
+DEFAULT_BATCH_SIZE = 100
+
+_AGGREGATIONS = ("sum", "mean")
+
+
+def align_and_aggregate(series: list[tuple[np.ndarray, np.ndarray]], how: str = "sum") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Combine (timestamps, values) pairs on the union of their timestamps.
+    Missing values are skipped (sum of present children, or mean of present children); a
+    timestamp is kept when at least one child has a value there.
+    """
+    if how not in _AGGREGATIONS:
+        raise ValueError(f"how must be one of {_AGGREGATIONS}, got {how!r}")
+    series = [(np.asarray(t, dtype=np.int64), np.asarray(v, dtype=float)) for t, v in series if len(t)]
+    if not series:
+        return np.array([], dtype=np.int64), np.array([], dtype=float)
+    union = np.unique(np.concatenate([t for t, _ in series]))
+    matrix = np.full((len(series), len(union)), np.nan)
+    for row, (timestamps, values) in enumerate(series):
+        matrix[row, np.searchsorted(union, timestamps)] = values
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    totals = np.where(present, matrix, 0.0).sum(axis=0)
+    keep = counts > 0
+    values = totals[keep] if how == "sum" else totals[keep] / counts[keep]
+    return union[keep], values
+
+
+def leaf_series_by_asset(
+    time_series: Iterable,
+    predicate: Callable[[object], bool] | None = None,
+    external_id_prefix: str = DEFAULT_EXTERNAL_ID_PREFIX,
+) -> dict[int, int]:
+    """
+    {asset_id: time series id} from listed time series (e.g. time_series.list(data_set_ids=[...])).
+    predicate: keep only matching series, e.g. `lambda ts: ts.name.endswith("_population")`.
+    Series created by a roll-up are skipped: those with the ROLLUP_METADATA_KEY metadata marker, or
+    an external id starting with external_id_prefix (use the HierarchicalRollup's prefix).
+    """
+    result = {}
+    for ts in time_series:
+        if ts.asset_id is None or ROLLUP_METADATA_KEY in (getattr(ts, "metadata", None) or {}):
+            continue
+        if external_id_prefix and (ts.external_id or "").startswith(external_id_prefix):
+            continue
+        if predicate is None or predicate(ts):
+            result.setdefault(ts.asset_id, ts.id)
+    return result
+
+
+class HierarchicalRollup:
+    """
+    client: CogniteClient
+    hierarchy: AssetHierarchyCache covering the assets to roll up.
+    leaf_series: {asset_id: time series id} for the assets that carry data (see leaf_series_by_asset).
+    how: "sum" or "mean" of the direct children.
+    data_set_id: data set for created roll-up series.
+    Keep the instance between runs (e.g. in a notebook) to get incremental updates.
+    """
+
+    def __init__(
+        self,
+        client,
+        hierarchy: AssetHierarchyCache,
+        leaf_series: dict[int, int],
+        how: str = "sum",
+        external_id_prefix: str = DEFAULT_EXTERNAL_ID_PREFIX,
+        data_set_id: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        if how not in _AGGREGATIONS:
+            raise ValueError(f"how must be one of {_AGGREGATIONS}, got {how!r}")
+        self.client = client
+        self.hierarchy = hierarchy
+        self.leaf_series = dict(leaf_series)
+        self.how = how
+        self.external_id_prefix = external_id_prefix
+        self.data_set_id = data_set_id
+        self.batch_size = batch_size
+        self._leaf_data: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._rollups: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._known_series: set[str] = set()
+
+    def rollup_external_id(self, asset_id: int) -> str:
+        """External id of the synthetic series for a parent asset."""
+        asset = self.hierarchy.get(asset_id)
+        return f"{self.external_id_prefix}{asset.external_id or asset.id}:{self.how}"
+
+    def fetch_new_datapoints(self) -> dict[int, int]:
+        """
+        Fetch datapoints newer than the last seen one for every leaf series.
+        Returns {asset_id: earliest new timestamp} for assets that received data.
+        """
+        queries = []
+        for asset_id, ts_id in self.leaf_series.items():
+            timestamps = self._leaf_data.get(asset_id, (np.array([], dtype=np.int64), None))[0]
+            start = int(timestamps[-1]) + 1 if len(timestamps) else MIN_TIMESTAMP_MS
+            queries.append(DatapointsQuery(id=ts_id, start=start))
+        asset_by_ts = {ts_id: asset_id for asset_id, ts_id in self.leaf_series.items()}
+        changed: dict[int, int] = {}
+        for i in range(0, len(queries), self.batch_size):
+            dps_list = limited_call(
+                self.client,
+                self.client.time_series.data.retrieve,
+                id=queries[i : i + self.batch_size],
+                end="now",
+                ignore_unknown_ids=True,
+            )
+            for dps in dps_list or []:
+                if not len(dps.timestamp):
+                    continue
+                asset_id = asset_by_ts[dps.id]
+                new_ts = np.asarray(dps.timestamp, dtype=np.int64)
+                new_values = np.asarray(dps.value, dtype=float)
+                old = self._leaf_data.get(asset_id)
+                if old is not None:
+                    new_ts, new_values = np.concatenate([old[0], new_ts]), np.concatenate([old[1], new_values])
+                self._leaf_data[asset_id] = (new_ts, new_values)
+                changed[asset_id] = int(dps.timestamp[0])
+        return changed
+
+    def dirty_parents(self, changed: dict[int, int]) -> dict[int, int]:
+        """{ancestor asset_id: earliest affected timestamp} for every ancestor of a changed asset."""
+        dirty: dict[int, int] = {}
+        for asset_id, since in changed.items():
+            if asset_id not in self.hierarchy:
+                continue
+            for ancestor in self.hierarchy.ancestors(asset_id):
+                dirty[ancestor.id] = min(since, dirty.get(ancestor.id, since))
+        return dirty
+
+    def _child_series(self, asset_id: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        series = []
+        for child in self.hierarchy.children(asset_id):
+            if child.id in self.leaf_series:
+                data = self._leaf_data.get(child.id)
+            else:
+                data = self._rollups.get(child.id)
+            if data is not None:
+                series.append(data)
+        return series
+
+    def recompute(self, parent_ids: Iterable[int]) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """Recompute these parents deepest first (children before their parents)."""
+        parents = set(parent_ids)
+        depth = {pid: len(self.hierarchy.ancestors(pid)) for pid in parents}
+        for pid in sorted(parents, key=lambda p: -depth[p]):
+            self._rollups[pid] = align_and_aggregate(self._child_series(pid), self.how)
+        return {pid: self._rollups[pid] for pid in parents}
+
+    def _ensure_series(self, parent_ids: Iterable[int]) -> None:
+        """Create missing synthetic series (one retrieve_multiple + one create for all of them)."""
+        wanted = {self.rollup_external_id(pid): pid for pid in parent_ids}
+        unknown = [x for x in wanted if x not in self._known_series]
+        if not unknown:
+            return
+        existing = limited_call(
+            self.client, self.client.time_series.retrieve_multiple, external_ids=unknown, ignore_unknown_ids=True
+        )
+        self._known_series.update(ts.external_id for ts in existing)
+        to_create = [
+            TimeSeries(
+                external_id=xid,
+                name=f"{self.hierarchy.get(wanted[xid]).name} ({self.how})",
+                asset_id=wanted[xid],
+                data_set_id=self.data_set_id,
+                metadata={ROLLUP_METADATA_KEY: self.how},
+            )
+            for xid in unknown
+            if xid not in self._known_series
+        ]
+        if to_create:
+            limited_call(self.client, self.client.time_series.create, to_create)
+            self._known_series.update(ts.external_id for ts in to_create)
+
+    def write(self, results: dict[int, tuple[np.ndarray, np.ndarray]], since: dict[int, int] | None = None) -> int:
+        """Insert roll-up datapoints (from `since[parent]` onward) in batched insert_multiple calls."""
+        items = []
+        for pid, (timestamps, values) in results.items():
+            mask = timestamps >= since[pid] if since and pid in since else slice(None)
+            if not len(timestamps[mask]):
+                continue
+            items.append(
+                {
+                    "external_id": self.rollup_external_id(pid),
+                    "datapoints": list(zip(timestamps[mask].tolist(), values[mask].tolist())),
+                }
+            )
+        if not items:
+            return 0
+        self._ensure_series(results)
+        for i in range(0, len(items), self.batch_size):
+            limited_call(self.client, self.client.time_series.data.insert_multiple, items[i : i + self.batch_size])
+        return sum(len(item["datapoints"]) for item in items)
+
+    def run(self, write: bool = True) -> pd.DataFrame:
+        """
+        One incremental pass: fetch new leaf datapoints, recompute affected parents, write them.
+        Returns a summary DataFrame (asset_id, name, external_id, since, datapoints) of updated parents.
+        """
+        changed = self.fetch_new_datapoints()
+        dirty = self.dirty_parents(changed)
+        results = self.recompute(dirty)
+        if write:
+            self.write(results, since=dirty)
+        rows = [
+            {
+                "asset_id": pid,
+                "name": self.hierarchy.get(pid).name,
+                "external_id": self.rollup_external_id(pid),
+                "since": pd.to_datetime(dirty[pid], unit="ms", utc=True),
+                "datapoints": int((results[pid][0] >= dirty[pid]).sum()),
+            }
+            for pid in sorted(results)
+        ]
+        return pd.DataFrame(rows, columns=["asset_id", "name", "external_id", "since", "datapoints"])
+
+    def to_pandas(self, asset_ids: Iterable[int] | None = None) -> pd.DataFrame:
+        """Computed roll-ups as a DataFrame (UTC datetime index, one column per parent asset name)."""
+        ids = list(asset_ids) if asset_ids is not None else sorted(self._rollups)
+        columns = {
+            self.hierarchy.get(pid).name: pd.Series(
+                self._rollups[pid][1], index=pd.to_datetime(self._rollups[pid][0], unit="ms", utc=True)
+            )
+            for pid in ids
+            if pid in self._rollups
+        }
+        return pd.DataFrame(columns)
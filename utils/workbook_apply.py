@@ -0,0 +1,166 @@
+"""
+Apply an edited groups workbook (the Y/N matrix written by export_groups / backup_groups_to_archive)
+as the desired state: compare it with a fresh matrix from build_customer_dataframe, build an
+add/remove plan per group, and apply it with batched /groups/update calls.
+Only capability columns present in the workbook are compared, so capabilities created after the
+export are left alone. Added keys are copied from an existing capability with the same key in the
+customer's groups; keys that exist nowhere cannot be created from the workbook and are reported.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from cognite_groups_export import build_customer_dataframe, extract_capability_key, get_group_capability_keys
+from rate_limiter import limited_call
+from remove_capabilities import UPDATE_BATCH_SIZE, update_groups_capabilities
+
+GROUP_COLUMNS = ["Group Name", "Group ID", "Source ID"]
+PLAN_COLUMNS = ["Group ID", "Group Name", "change", "capability"]
+
+
+def read_groups_workbook(path: Path | str) -> dict[str, pd.DataFrame]:
+    """Read every customer sheet; sheets written for failed fetches (an "Error" column) are skipped."""
+    sheets = pd.read_excel(path, sheet_name=None, engine="openpyxl")
+    return {name: df for name, df in sheets.items() if "Group ID" in df.columns}
+
+
+def _yn_matrix(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Boolean matrix indexed by Group ID; raises ValueError on anything other than Y/N."""
+    values = df.set_index("Group ID")[columns].astype("string").apply(lambda s: s.str.strip().str.upper())
+    bad = ~values.isin(["Y", "N"])
+    if bad.to_numpy().any():
+        columns_with_bad = list(values.columns[bad.any(axis=0)])
+        raise ValueError(f"Expected only Y/N in capability columns; found other values in: {columns_with_bad[:10]}")
+    return values.eq("Y")
+
+
+def plan_capability_changes(desired: pd.DataFrame, groups: list) -> pd.DataFrame:
+    """
+    Compare an edited sheet (desired) with the groups' current capabilities.
+    Returns PLAN_COLUMNS rows, one per (group, capability key) to add or remove. Groups in the
+    sheet that no longer exist are ignored, as are groups that exist but are not in the sheet.
+    """
+    cap_columns = [c for c in desired.columns if c not in GROUP_COLUMNS]
+    current = build_customer_dataframe(groups, cap_columns) if groups else None
+    if current is None or current.empty or not cap_columns:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    want = _yn_matrix(desired, cap_columns)
+    have = _yn_matrix(current, cap_columns)
+    common = want.index.intersection(have.index)
+    want, have = want.loc[common], have.loc[common]
+
+    changes = pd.concat({"add": want & ~have, "remove": have & ~want}, names=["change", "Group ID"])
+    changes.columns.name = "capability"
+    stacked = changes.stack()
+    plan = stacked[stacked].reset_index()[["Group ID", "change", "capability"]]
+    names = current.set_index("Group ID")["Group Name"]
+    plan.insert(1, "Group Name", plan["Group ID"].map(names))
+    return plan.sort_values(["Group ID", "change", "capability"]).reset_index(drop=True)[PLAN_COLUMNS]
+
+
+def split_capability_actions(capability) -> list:
+    """One capability per action (same ACL and scope), so single keys can be removed or copied."""
+    from cognite.client.data_classes.capabilities import Capability
+
+    dumped = capability.dump(camel_case=True)
+    (acl_name, body), = dumped.items()
+    actions = body.get("actions") or []
+    if len(actions) <= 1:
+        return [capability]
+    return [Capability.load({acl_name: {**body, "actions": [action]}}, allow_unknown=True) for action in actions]
+
+
+def capability_templates(groups: list) -> dict[str, object]:
+    """{capability key: single-action Capability} from every capability in these groups."""
+    templates = {}
+    for group in groups:
+        for cap in getattr(group, "capabilities", None) or []:
+            for single in split_capability_actions(cap):
+                key = extract_capability_key(single)
+                if isinstance(key, str):
+                    templates.setdefault(key, single)
+    return templates
+
+
+def _new_capabilities(group, add: set[str], remove: set[str], templates: dict) -> tuple[list, set[str]]:
+    """Group's capabilities after the plan; also returns the added keys that had no template."""
+    result = []
+    for cap in getattr(group, "capabilities", None) or []:
+        keys = extract_capability_key(cap)
+        key_list = [keys] if isinstance(keys, str) else (keys or [])
+        if not remove.intersection(key_list):
+            result.append(cap)
+            continue
+        result.extend(s for s in split_capability_actions(cap) if extract_capability_key(s) not in remove)
+    present = get_group_capability_keys(group)
+    missing = set()
+    for key in sorted(add - present):
+        if key in templates:
+            result.append(templates[key])
+        else:
+            missing.add(key)
+    return result, missing
+
+
+def apply_capability_plan(
+    client,
+    groups: list,
+    plan: pd.DataFrame,
+    dry_run: bool = True,
+    batch_size: int = UPDATE_BATCH_SIZE,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Apply a plan from plan_capability_changes to these groups (all of the customer's groups, so
+    added keys can be copied from other groups). Returns the plan with a "status" column:
+    "planned" (dry run), "applied", or "no template" for keys that could not be created.
+    compact: re-merge the per-action entries created by removals (see capability_compaction).
+    """
+    result = plan.assign(status="planned")
+    if plan.empty:
+        return result
+    templates = capability_templates(groups)
+    by_id = {g.id: g for g in groups}
+    updates = {}
+    for gid, rows in plan.groupby("Group ID", sort=False):
+        add = set(rows.loc[rows["change"] == "add", "capability"])
+        remove = set(rows.loc[rows["change"] == "remove", "capability"])
+        new_caps, missing = _new_capabilities(by_id[gid], add, remove, templates)
+        if missing:
+            result.loc[(result["Group ID"] == gid) & result["capability"].isin(missing), "status"] = "no template"
+        updates[gid] = new_caps
+        if dry_run:
+            print(
+                f"  [dry run] Group {by_id[gid].name!r} (id={gid}): "
+                f"+{len(add) - len(missing)} / -{len(remove)} capability keys"
+            )
+    if dry_run:
+        return result
+    update_groups_capabilities(client, updates, batch_size=batch_size, compact=compact)
+    result.loc[result["status"] == "planned", "status"] = "applied"
+    print(f"  Updated {len(updates)} groups")
+    return result
+
+
+def apply_groups_workbook(
+    client,
+    customer: str,
+    workbook_path: Path | str,
+    dry_run: bool = True,
+    batch_size: int = UPDATE_BATCH_SIZE,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Read the customer's sheet from an edited workbook, fetch live groups, plan and apply the changes.
+    Back up first (backup_groups_to_archive) when dry_run is False.
+    compact: passed on to apply_capability_plan.
+    """
+    sheets = read_groups_workbook(workbook_path)
+    sheet_name = customer[:31]
+    if sheet_name not in sheets:
+        raise ValueError(f"No sheet for customer {customer!r} in {workbook_path}. Sheets: {list(sheets)}")
+    groups = list(limited_call(client, client.iam.groups.list, all=True))
+    plan = plan_capability_changes(sheets[sheet_name], groups)
+    return apply_capability_plan(client, groups, plan, dry_run=dry_run, batch_size=batch_size, compact=compact)